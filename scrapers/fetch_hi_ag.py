@@ -6,6 +6,7 @@ import time
 import random
 import re
 import io
+import functools
 from bs4 import BeautifulSoup
 from datetime import datetime, date, timedelta
 from urllib.parse import urljoin
@@ -25,7 +26,10 @@ logger = logging.getLogger(__name__)
 
 # Constants
 HAWAII_AG_BREACH_URL = "https://cca.hawaii.gov/ocp/notices/security-breach/"
+HAWAII_AG_SITE_URL = "https://cca.hawaii.gov/ocp/"  # WordPress site root for attachment pages
 SOURCE_ID_HAWAII_AG = 6
+HAWAII_AG_BASE_TAGS = ("hawaii_ag", "hi_breach", "security_notification")
+BREACH_TYPE_TRANS = str.maketrans({' ': '_', '/': '_'})  # Turns unmapped breach types into category slugs
 
 # Configuration for date filtering
 # Set to None to collect all historical data (for testing)
@@ -40,12 +44,20 @@ FILTER_FROM_DATE = os.environ.get("HI_AG_FILTER_FROM_DATE", default_date)
 # FULL: Everything including PDF analysis (slow, for research/analysis)
 PROCESSING_MODE = os.environ.get("HI_AG_PROCESSING_MODE", "ENHANCED")  # BASIC, ENHANCED, FULL
 
+# In FULL mode, try the WordPress HTML preview of a letter before its PDF.
+# Off by default: each preview costs an extra rate-limited request when it has no letter text.
+USE_HTML_PREVIEW = os.environ.get("HI_AG_USE_HTML_PREVIEW", "false").lower() == "true"
+
 # Rate limiting configuration
 MIN_DELAY_SECONDS = 2  # Minimum delay between requests
 MAX_DELAY_SECONDS = 5  # Maximum delay between requests
 REQUEST_TIMEOUT = 60   # Increased timeout for PDF downloads
 MAX_RETRIES = 3        # Maximum number of retries for failed requests
 
+# Database configuration
+INSERT_BATCH_SIZE = 50  # New records buffered per bulk insert request
+INSERT_MAX_WORKERS = 4  # Enhancement updates sent concurrently per flush
+
 # Headers for requests
 REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -154,10 +166,18 @@ def normalize_breach_type(breach_type_str: str) -> list:
 
     # If no specific mapping found, use the original as a category
     if not categories:
-        categories.append(breach_type_str.lower().replace(' ', '_').replace('/', '_'))
+        categories.append(breach_type_lower.translate(BREACH_TYPE_TRANS))
 
     return categories
 
+@functools.lru_cache(maxsize=256)
+def build_tags(breach_categories: tuple) -> list:
+    """
+    Build the deduplicated tag list for a breach record.
+    Cached because most rows share one of a handful of breach category combinations.
+    """
+    return list(set(HAWAII_AG_BASE_TAGS).union(breach_categories))
+
 def rate_limit_delay():
     """
     Add a random delay between requests to avoid overwhelming the server.
@@ -281,11 +301,78 @@ def extract_affected_individuals_from_pdf(content: str) -> dict:
 
     return result
 
-def analyze_pdf_content(pdf_url: str) -> dict:
+def extract_text_with_pdfium(pdf_bytes: bytes) -> str:
+    """
+    Extract text from PDF bytes using pypdfium2.
+    Raises ImportError if pypdfium2 is not installed.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        return "\n".join(pdf[i].get_textpage().get_text_range() for i in range(len(pdf)))
+    finally:
+        pdf.close()
+
+def analyze_html_content(html_url: str) -> dict | None:
+    """
+    Analyze the WordPress attachment page for a breach letter instead of the PDF.
+    Returns an analysis dict shaped like analyze_pdf_content() but marked
+    html_analyzed rather than pdf_analyzed, or None if the page has no letter
+    content area or no usable letter text, so the caller can fall back to the PDF.
+    """
+    try:
+        logger.info(f"Analyzing Hawaii AG letter HTML preview: {html_url}")
+        rate_limit_delay()
+
+        response = requests.get(html_url, headers=REQUEST_HEADERS, timeout=30)
+        response.raise_for_status()
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only the letter body - the rest of the page (navigation, sidebar, footer) would skew the extractors
+        content_div = soup.find('div', class_='entry-content')
+        if not content_div:
+            return None
+
+        text_content = clean_text_for_database(content_div.get_text('\n', strip=True))
+        content = text_content.lower()
+
+        affected_individuals = extract_affected_individuals_from_pdf(content)
+        what_information_involved = extract_what_information_involved(content)
+
+        # Attachment pages often only link to the PDF - only trust pages that yielded data
+        if not affected_individuals['count'] and not what_information_involved['what_information_involved_text']:
+            logger.debug(f"No letter text found on HTML preview {html_url}, falling back to PDF")
+            return None
+
+        return {
+            'pdf_analyzed': False,
+            'html_analyzed': True,
+            'html_url': html_url,
+            'extraction_source': 'html_preview',
+            'affected_individuals': affected_individuals,
+            'what_information_involved': what_information_involved,
+            'raw_text': text_content[:1000],  # Store sample
+            'extraction_confidence': 'high'
+        }
+
+    except Exception as e:
+        logger.warning(f"Could not analyze HTML preview {html_url}: {e}")
+        return None
+
+def analyze_pdf_content(pdf_url: str, html_url: str = None) -> dict:
     """
     Enhanced PDF content analysis for comprehensive breach details (Tier 3).
     Extracts affected individuals, data types, and incident details from Hawaii AG PDFs.
+    If an HTML preview of the letter is given and USE_HTML_PREVIEW is set, it is tried
+    first, skipping PDF parsing.
     """
+    if html_url and USE_HTML_PREVIEW:
+        html_analysis = analyze_html_content(html_url)
+        if html_analysis:
+            html_analysis['pdf_url'] = pdf_url
+            return html_analysis
+
     try:
         logger.info(f"Analyzing Hawaii AG PDF: {pdf_url}")
 
@@ -298,7 +385,7 @@ def analyze_pdf_content(pdf_url: str) -> dict:
             'extraction_confidence': 'low'  # Track confidence in extraction
         }
 
-        # Extract PDF content using local libraries (PyPDF2 and pdfplumber)
+        # Extract PDF content using local libraries (pypdfium2, PyPDF2 and pdfplumber)
         try:
             # Add rate limiting delay before PDF request
             rate_limit_delay()
@@ -306,44 +393,32 @@ def analyze_pdf_content(pdf_url: str) -> dict:
             # Download PDF content
             response = requests.get(pdf_url, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT)
             if response.status_code == 200:
-                # Try to extract text from PDF using PyPDF2 first
+                # Try pypdfium2 (native PDFium) first - much faster than the pure-Python parsers
+                text_content = ""
                 try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(response.content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-                    text_content = ""
-                    for page in pdf_reader.pages:
-                        text_content += page.extract_text() + "\n"
-
-                    if text_content.strip():
-                        # Clean the extracted text to prevent Unicode errors in database
-                        text_content = clean_text_for_database(text_content)
-                        content = text_content.lower()
-                        pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
-                        pdf_analysis['extraction_confidence'] = 'high'
-                        logger.debug(f"PyPDF2 extraction successful for {pdf_url}")
-                    else:
-                        raise Exception("No text extracted from PDF with PyPDF2")
-
+                    text_content = extract_text_with_pdfium(response.content)
                 except ImportError:
-                    logger.debug("PyPDF2 not available, trying pdfplumber")
-                    raise Exception("PyPDF2 not available")
-
-                except Exception as pypdf_error:
-                    logger.debug(f"PyPDF2 extraction failed: {pypdf_error}, trying pdfplumber")
-
-                    # Try pdfplumber as alternative
+                    logger.debug("pypdfium2 not available, trying PyPDF2")
+                except Exception as pdfium_error:
+                    logger.debug(f"pypdfium2 extraction failed: {pdfium_error}, trying PyPDF2")
+
+                if text_content.strip():
+                    # Clean the extracted text to prevent Unicode errors in database
+                    text_content = clean_text_for_database(text_content)
+                    content = text_content.lower()
+                    pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
+                    pdf_analysis['extraction_confidence'] = 'high'
+                    logger.debug(f"pypdfium2 extraction successful for {pdf_url}")
+                else:
+                    # Fall back to PyPDF2, then pdfplumber
                     try:
-                        import pdfplumber
+                        import PyPDF2
                         pdf_file = io.BytesIO(response.content)
+                        pdf_reader = PyPDF2.PdfReader(pdf_file)
 
                         text_content = ""
-                        with pdfplumber.open(pdf_file) as pdf:
-                            for page in pdf.pages:
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text_content += page_text + "\n"
+                        for page in pdf_reader.pages:
+                            text_content += page.extract_text() + "\n"
 
                         if text_content.strip():
                             # Clean the extracted text to prevent Unicode errors in database
@@ -351,22 +426,51 @@ def analyze_pdf_content(pdf_url: str) -> dict:
                             content = text_content.lower()
                             pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
                             pdf_analysis['extraction_confidence'] = 'high'
-                            logger.debug(f"pdfplumber extraction successful for {pdf_url}")
+                            logger.debug(f"PyPDF2 extraction successful for {pdf_url}")
                         else:
-                            raise Exception("No text extracted from PDF with pdfplumber")
+                            raise Exception("No text extracted from PDF with PyPDF2")
 
                     except ImportError:
-                        logger.error("Neither PyPDF2 nor pdfplumber available for PDF parsing")
-                        raise Exception("No PDF parsing libraries available")
-
-                    except Exception as pdfplumber_error:
-                        logger.debug(f"pdfplumber extraction failed: {pdfplumber_error}")
-                        # Last resort: try to extract any readable text from response
-                        fallback_text = clean_text_for_database(response.text)
-                        content = fallback_text.lower()
-                        pdf_analysis['raw_text'] = fallback_text[:1000]  # Store sample
-                        pdf_analysis['extraction_confidence'] = 'low'
-                        logger.warning(f"Using low-confidence text extraction for {pdf_url}")
+                        logger.debug("PyPDF2 not available, trying pdfplumber")
+                        raise Exception("PyPDF2 not available")
+
+                    except Exception as pypdf_error:
+                        logger.debug(f"PyPDF2 extraction failed: {pypdf_error}, trying pdfplumber")
+
+                        # Try pdfplumber as alternative
+                        try:
+                            import pdfplumber
+                            pdf_file = io.BytesIO(response.content)
+
+                            text_content = ""
+                            with pdfplumber.open(pdf_file) as pdf:
+                                for page in pdf.pages:
+                                    page_text = page.extract_text()
+                                    if page_text:
+                                        text_content += page_text + "\n"
+
+                            if text_content.strip():
+                                # Clean the extracted text to prevent Unicode errors in database
+                                text_content = clean_text_for_database(text_content)
+                                content = text_content.lower()
+                                pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
+                                pdf_analysis['extraction_confidence'] = 'high'
+                                logger.debug(f"pdfplumber extraction successful for {pdf_url}")
+                            else:
+                                raise Exception("No text extracted from PDF with pdfplumber")
+
+                        except ImportError:
+                            logger.error("Neither PyPDF2 nor pdfplumber available for PDF parsing")
+                            raise Exception("No PDF parsing libraries available")
+
+                        except Exception as pdfplumber_error:
+                            logger.debug(f"pdfplumber extraction failed: {pdfplumber_error}")
+                            # Last resort: try to extract any readable text from response
+                            fallback_text = clean_text_for_database(response.text)
+                            content = fallback_text.lower()
+                            pdf_analysis['raw_text'] = fallback_text[:1000]  # Store sample
+                            pdf_analysis['extraction_confidence'] = 'low'
+                            logger.warning(f"Using low-confidence text extraction for {pdf_url}")
             else:
                 raise Exception(f"HTTP request failed: {response.status_code}")
 
@@ -443,26 +547,30 @@ def fetch_table_data() -> list:
     # Column headers from Firecrawl analysis: Date Notified, Case Number, Breached Entity Name, Breach type, Hawaii Residents Impacted, Link to Letter
     for row_idx, row in enumerate(notifications):
         cols = row.find_all('td')
+        # Walk each text cell's subtree once; the link column is only searched for its <a>
+        cell_texts = [col.get_text(strip=True) for col in cols[:5]]
 
         if len(cols) < 5:  # Expecting at least 5 columns based on Firecrawl analysis
-            logger.warning(f"Skipping row {row_idx+1} due to insufficient columns ({len(cols)}). Row content: {[c.get_text(strip=True)[:30] for c in cols]}")
+            logger.warning(f"Skipping row {row_idx+1} due to insufficient columns ({len(cols)}). Row content: {[text[:30] for text in cell_texts]}")
             continue
 
         try:
             # Extract all available columns
-            date_notified_str = cols[0].get_text(strip=True)
-            case_number = cols[1].get_text(strip=True)
-            breached_entity_name = cols[2].get_text(strip=True)
-            breach_type = cols[3].get_text(strip=True)
-            hawaii_residents_impacted = cols[4].get_text(strip=True)
+            date_notified_str, case_number, breached_entity_name, breach_type, hawaii_residents_impacted = cell_texts
 
             # Extract PDF link if available
             pdf_link = None
+            html_link = None
             if len(cols) > 5:  # Link to Letter column
                 pdf_link_tag = cols[5].find('a', href=True)
                 if pdf_link_tag:
                     pdf_link = urljoin(HAWAII_AG_BREACH_URL, pdf_link_tag['href'])
 
+                    # WordPress attachment links expose an HTML page for the same letter
+                    attachment_id = pdf_link_tag.get('data-attachment-id')
+                    if attachment_id and pdf_link.lower().endswith('.pdf'):
+                        html_link = f"{HAWAII_AG_SITE_URL}?attachment_id={attachment_id}"
+
             if not breached_entity_name or not date_notified_str:
                 logger.warning(f"Skipping row {row_idx+1} due to missing essential data: Entity='{breached_entity_name}', Date='{date_notified_str}'")
                 continue
@@ -488,6 +596,7 @@ def fetch_table_data() -> list:
                 'breach_categories': breach_categories,
                 'affected_individuals': affected_individuals,
                 'pdf_url': pdf_link,
+                'html_url': html_link,
                 'incident_uid': incident_uid,
                 'raw_table_data': {
                     'date_notified_original': date_notified_str,
@@ -495,7 +604,8 @@ def fetch_table_data() -> list:
                     'breached_entity_name': breached_entity_name,
                     'breach_type': breach_type,
                     'hawaii_residents_impacted': hawaii_residents_impacted,
-                    'pdf_link': pdf_link
+                    'pdf_link': pdf_link,
+                    'html_link': html_link
                 }
             }
 
@@ -535,7 +645,7 @@ def enhance_breach_data(breach_record: dict) -> dict:
             try:
                 if PROCESSING_MODE == "FULL":
                     # Full PDF analysis
-                    pdf_analysis = analyze_pdf_content(enhanced_data['pdf_url'])
+                    pdf_analysis = analyze_pdf_content(enhanced_data['pdf_url'], enhanced_data.get('html_url'))
                     enhanced_data['tier_2_pdf_analysis'] = pdf_analysis
                 else:
                     # ENHANCED mode: Store PDF URL for later analysis but don't process now
@@ -575,6 +685,44 @@ def enhance_breach_data(breach_record: dict) -> dict:
         }
         return enhanced_data  # Return enhanced_data with errors logged, not the original record
 
+def flush_pending_inserts(supabase_client: SupabaseClient, pending_inserts: list) -> int:
+    """
+    Bulk insert buffered records and clear the buffer.
+    Returns the number of records actually written.
+    """
+    if not pending_inserts:
+        return 0
+
+    inserted = supabase_client.insert_items(pending_inserts, batch_size=INSERT_BATCH_SIZE)
+    inserted_urls = {row.get('item_url') for row in inserted}
+    for db_item in pending_inserts:
+        if db_item['item_url'] in inserted_urls:
+            logger.info(f"✅ Successfully inserted new item for {db_item['title']}")
+        else:
+            logger.error(f"❌ Failed to insert item for {db_item['title']}")
+
+    pending_inserts.clear()
+    return len(inserted)
+
+def flush_pending_updates(supabase_client: SupabaseClient, pending_updates: list) -> int:
+    """
+    Bulk update buffered records with their new enhancement data and clear the buffer.
+    Returns the number of records actually updated.
+    """
+    if not pending_updates:
+        return 0
+
+    updated = supabase_client.update_items_enhancement(pending_updates, max_workers=INSERT_MAX_WORKERS)
+    updated_urls = {row.get('item_url') for row in updated}
+    for db_item in pending_updates:
+        if db_item['item_url'] in updated_urls:
+            logger.info(f"✅ Successfully updated enhancement data for {db_item['title']}")
+        else:
+            logger.error(f"❌ Failed to update enhancement data for {db_item['title']}")
+
+    pending_updates.clear()
+    return len(updated)
+
 def process_hawaii_ag_breaches():
     """
     Enhanced Hawaii AG breach scraper using 3-tier approach.
@@ -635,9 +783,18 @@ def process_hawaii_ag_breaches():
         else:
             logger.info(f"Collected {len(filtered_breaches)} total historical breaches (no filtering)")
 
+        # Pre-fetch enhancement status for all existing Hawaii AG items in one query
+        try:
+            existing_statuses = supabase_client.get_enhancement_statuses_for_source(SOURCE_ID_HAWAII_AG)
+        except Exception as e:
+            logger.warning(f"Could not pre-fetch existing items, falling back to per-record lookups: {e}")
+            existing_statuses = None
+
         # Process each breach record
         processed_count = 0
         total_breaches = len(filtered_breaches)
+        pending_inserts = []  # New records waiting for the next bulk insert
+        pending_updates = []  # Existing records waiting for the next bulk enhancement update
 
         for i, breach_record in enumerate(filtered_breaches, 1):
             try:
@@ -654,8 +811,9 @@ def process_hawaii_ag_breaches():
 
                 # Extract from enhanced PDF analysis if available
                 what_information_involved_text = None
-                if enhanced_record.get('tier_2_pdf_analysis', {}).get('pdf_analyzed'):
-                    pdf_analysis = enhanced_record['tier_2_pdf_analysis']
+                letter_analysis = enhanced_record.get('tier_2_pdf_analysis', {})
+                if letter_analysis.get('pdf_analyzed') or letter_analysis.get('html_analyzed'):
+                    pdf_analysis = letter_analysis
 
                     # Extract affected individuals with confidence scoring (PDF might have more accurate count)
                     if pdf_analysis.get('affected_individuals'):
@@ -673,33 +831,27 @@ def process_hawaii_ag_breaches():
                     if what_info and isinstance(what_info, dict):
                         what_information_involved_text = what_info.get('what_information_involved_text')
 
-                # Create enhanced summary
-                summary_parts = [f"Data breach reported by {enhanced_record['organization_name']}"]
-                if enhanced_record.get('breach_categories'):
-                    summary_parts.append(f"Breach type: {', '.join(enhanced_record['breach_categories'])}")
-                if affected_individuals:
-                    summary_parts.append(f"Affected Hawaii residents: {affected_individuals:,}")
+                # Build summary and full content as fixed-size tuples; optional parts are None and filtered out
+                categories_text = ', '.join(enhanced_record['breach_categories']) if enhanced_record.get('breach_categories') else None
 
-                summary_text = ". ".join(summary_parts)
+                # Create enhanced summary
+                summary_text = ". ".join(filter(None, (
+                    f"Data breach reported by {enhanced_record['organization_name']}",
+                    f"Breach type: {categories_text}" if categories_text else None,
+                    f"Affected Hawaii residents: {affected_individuals:,}" if affected_individuals else None,
+                )))
 
                 # Create enhanced full content
-                content_parts = [
+                full_content = "\n".join(filter(None, (
                     f"Organization: {enhanced_record['organization_name']}",
                     f"Case Number: {enhanced_record['case_number']}",
                     f"Reported Date: {enhanced_record['reported_date'] or 'Not specified'}",
-                    f"Breach Type: {enhanced_record['breach_type_original']}"
-                ]
-
-                if enhanced_record.get('breach_categories'):
-                    content_parts.append(f"Breach Categories: {', '.join(enhanced_record['breach_categories'])}")
-                if affected_individuals:
-                    content_parts.append(f"Hawaii Residents Affected: {affected_individuals:,}")
-                if notice_document_url:
-                    content_parts.append(f"Notification Document: {notice_document_url}")
-                if what_information_involved_text:
-                    content_parts.append(f"What Information Was Involved: {what_information_involved_text}")
-
-                full_content = "\n".join(content_parts)
+                    f"Breach Type: {enhanced_record['breach_type_original']}",
+                    f"Breach Categories: {categories_text}" if categories_text else None,
+                    f"Hawaii Residents Affected: {affected_individuals:,}" if affected_individuals else None,
+                    f"Notification Document: {notice_document_url}" if notice_document_url else None,
+                    f"What Information Was Involved: {what_information_involved_text}" if what_information_involved_text else None,
+                )))
 
                 # Determine what_was_leaked value with PDF URL fallback
                 what_was_leaked_value = what_information_involved_text
@@ -707,11 +859,6 @@ def process_hawaii_ag_breaches():
                     what_was_leaked_value = f"See breach details in PDF: {notice_document_url}"
                     logger.info(f"📄 Using PDF URL fallback for what_was_leaked: {enhanced_record['organization_name']}")
 
-                # Create tags including breach categories
-                tags = ["hawaii_ag", "hi_breach", "security_notification"]
-                if enhanced_record.get('breach_categories'):
-                    tags.extend(enhanced_record['breach_categories'])
-
                 db_item = {
                     'source_id': SOURCE_ID_HAWAII_AG,
                     'item_url': notice_document_url or f"{HAWAII_AG_BREACH_URL}#{enhanced_record['case_number']}",
@@ -723,7 +870,7 @@ def process_hawaii_ag_breaches():
                     'affected_individuals': affected_individuals,
                     'notice_document_url': notice_document_url,
                     'what_was_leaked': what_was_leaked_value,  # New dedicated column for extracted section (with PDF URL fallback)
-                    'tags_keywords': list(set(tags)),
+                    'tags_keywords': build_tags(tuple(enhanced_record.get('breach_categories') or ())),  # Tags including breach categories
                     'raw_data_json': {
                         'scraper_version': '2.0_enhanced_hawaii_ag',
                         'tier_1_table_data': enhanced_record['raw_table_data'],
@@ -740,7 +887,8 @@ def process_hawaii_ag_breaches():
                         'pdf_analysis_summary': {
                             'affected_individuals_extracted': affected_individuals,
                             'what_information_involved_extracted': bool(what_information_involved_text),
-                            'pdf_document_analyzed': enhanced_record.get('tier_2_pdf_analysis', {}).get('pdf_analyzed', False)
+                            'pdf_document_analyzed': enhanced_record.get('tier_2_pdf_analysis', {}).get('pdf_analyzed', False),
+                            'html_preview_analyzed': enhanced_record.get('tier_2_pdf_analysis', {}).get('html_analyzed', False)
                         }
                     }
                 }
@@ -752,7 +900,10 @@ def process_hawaii_ag_breaches():
 
                 # Smart duplicate handling: Check if item exists and if it needs enhancement updates
                 item_url = db_item['item_url']
-                enhancement_status = supabase_client.get_item_enhancement_status(item_url)
+                if existing_statuses is not None:
+                    enhancement_status = existing_statuses.get(item_url, {'exists': False})
+                else:
+                    enhancement_status = supabase_client.get_item_enhancement_status(item_url)
 
                 if enhancement_status['exists']:
                     # Item exists - check if we should update it with better enhancement data
@@ -778,27 +929,25 @@ def process_hawaii_ag_breaches():
 
                     if should_update:
                         logger.info(f"🔄 Updating existing item for {enhanced_record['organization_name']}: {', '.join(update_reasons)}")
-                        update_success = supabase_client.update_item_enhancement(enhancement_status['item_id'], db_item)
-                        if update_success:
-                            logger.info(f"✅ Successfully updated enhancement data for {enhanced_record['organization_name']}")
-                            processed_count += 1
-                        else:
-                            logger.error(f"❌ Failed to update enhancement data for {enhanced_record['organization_name']}")
+                        pending_updates.append(db_item)
+                        if len(pending_updates) >= INSERT_BATCH_SIZE:
+                            processed_count += flush_pending_updates(supabase_client, pending_updates)
                     else:
                         logger.debug(f"⏭️  Skipping {enhanced_record['organization_name']} - already exists with adequate data")
                 else:
-                    # New item - insert it
-                    insert_response = supabase_client.insert_item(**db_item)
-                    if insert_response:
-                        logger.info(f"✅ Successfully inserted new item for {enhanced_record['organization_name']}")
-                        processed_count += 1
-                    else:
-                        logger.error(f"❌ Failed to insert item for {enhanced_record['organization_name']}")
+                    # New item - buffer it for the next bulk insert
+                    pending_inserts.append(db_item)
+                    if len(pending_inserts) >= INSERT_BATCH_SIZE:
+                        processed_count += flush_pending_inserts(supabase_client, pending_inserts)
 
             except Exception as e:
-                logger.error(f"Error processing breach for '{breach_record.get('organization_name', 'Unknown')}': {e}", exc_info=True)
+                logger.warning("Error processing breach for '%s': %s", breach_record.get('organization_name', 'Unknown'), e)
                 continue
 
+        # Flush whatever is left after the last full batch
+        processed_count += flush_pending_inserts(supabase_client, pending_inserts)
+        processed_count += flush_pending_updates(supabase_client, pending_updates)
+
         logger.info(f"Finished processing Hawaii AG breaches. Total processed: {processed_count}/{total_breaches}")
 
     except Exception as e:
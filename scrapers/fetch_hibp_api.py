@@ -1,7 +1,12 @@
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urljoin, quote # quote for URL encoding breach name
 from dateutil import parser as dateutil_parser
@@ -27,13 +32,72 @@ USER_AGENT = "PwnedBreachScraper/1.0 (github.com/ComprehensiveBreachDataDashboar
 # HIBP API recommends a delay of 1500ms (1.5s) between calls to a single API endpoint.
 # The /breaches endpoint is a single call, but good practice if we add more later.
 HIBP_API_DELAY_SECONDS = 2.0
+HIBP_RATE_LIMIT_RETRIES = 3 # Attempts when HIBP answers 429 Too Many Requests
+HIBP_DEFAULT_RETRY_AFTER_SECONDS = 5.0 # Used when a 429 has no usable retry-after header
 
+# Monotonic timestamp of the last HIBP API call, used to pace calls only when needed
+_last_call_ts = None
+
+# Number of breach entries sent to Supabase per bulk upsert request
+HIBP_INSERT_BATCH_SIZE = 500
+
+# Worker threads used to build rows from breach entries before each bulk upsert
+HIBP_PREPROCESS_WORKERS = 8
+
+# Tags applied to every HIBP item, plus tags added when a breach flag is set
+_HIBP_BASE_TAGS = ("hibp", "data_breach")
+_FLAG_TAGS = {
+    "IsVerified": "verified_breach",
+    "IsSensitive": "sensitive_breach",
+    "IsFabricated": "fabricated_breach", # Unlikely to be useful but good to know
+    "IsRetired": "retired_breach", # Data no longer searchable on HIBP
+    "IsSpamList": "spam_list",
+}
+
+# Translation table for turning data classes into tags (space -> underscore, drop apostrophes)
+_TAG_TRANS = str.maketrans({" ": "_", "'": None})
+
+# Shared HTTP session so any future per-breach/per-account calls reuse the same connections
+_session = None
+
+def get_session(hibp_api_key: str) -> requests.Session:
+    """
+    Get or create a persistent HIBP API session with pooled connections,
+    gzip transfer encoding and automatic retries on transient errors.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update({
+            'hibp-api-key': hibp_api_key,
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json', # Expecting JSON response
+            'Accept-Encoding': 'gzip, deflate' # requests decompresses transparently
+        })
+        retries = Retry(
+            total=3,
+            backoff_factor=1.5,
+            status_forcelist=[500, 502, 503, 504], # 429 is paced by retry-after in fetch_with_rate_limit()
+            raise_on_status=False # Return the last response so status codes are still logged below
+        )
+        _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+        logger.info("Created new HIBP API session")
+    return _session
+
+@functools.lru_cache(maxsize=4096)
 def parse_date_hibp(date_str: str) -> str | None:
     """
     Parses date string (YYYY-MM-DD or YYYY-MM-DDTHH:mm:ssZ) to ISO 8601 (YYYY-MM-DDTHH:MM:SS).
+    Results are cached since many breaches share the same AddedDate/ModifiedDate values.
     """
     if not date_str:
         return None
+    # Fast path for plain BreachDate values (YYYY-MM-DD) - avoids dateutil entirely
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return datetime.fromisoformat(date_str).isoformat()
+        except ValueError:
+            pass  # Fall through to the flexible parser below
     try:
         # dateutil.parser is good at handling various ISO-like formats including ones with 'Z'
         dt_object = dateutil_parser.isoparse(date_str) 
@@ -47,6 +111,146 @@ def parse_date_hibp(date_str: str) -> str | None:
             logger.warning(f"Could not parse date string from HIBP: '{date_str}'. Error: {e}, Fallback Error: {e_fallback}")
             return None
 
+def wait_for_rate_limit():
+    """
+    Sleeps only for whatever remains of HIBP_API_DELAY_SECONDS since the last API call.
+    The first call of a run goes out immediately.
+    """
+    global _last_call_ts
+    if _last_call_ts is not None:
+        wait = HIBP_API_DELAY_SECONDS - (time.monotonic() - _last_call_ts)
+        if wait > 0:
+            logger.info(f"Waiting {wait:.1f} seconds before next HIBP API call due to rate limits...")
+            time.sleep(wait)
+    _last_call_ts = time.monotonic()
+
+
+def fetch_with_rate_limit(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """
+    GETs an HIBP API URL, honouring the retry-after header on 429 responses.
+    Returns the last response (which may still be a 429 once retries are exhausted).
+    """
+    for attempt in range(1, HIBP_RATE_LIMIT_RETRIES + 1):
+        wait_for_rate_limit()
+        response = session.get(url, **kwargs)
+        if response.status_code != 429 or attempt == HIBP_RATE_LIMIT_RETRIES:
+            return response
+
+        try:
+            retry_after = float(response.headers.get("retry-after", HIBP_DEFAULT_RETRY_AFTER_SECONDS))
+        except ValueError:
+            retry_after = HIBP_DEFAULT_RETRY_AFTER_SECONDS
+        logger.warning(f"HIBP API rate limit hit (attempt {attempt}/{HIBP_RATE_LIMIT_RETRIES}). Retrying after {retry_after} seconds...")
+        response.close()
+        time.sleep(retry_after)
+
+
+def iter_breach_entries(response: requests.Response):
+    """
+    Yields HIBP breach entries one at a time from a streamed /breaches response.
+    ijson (a requirement) parses the stream so the full payload is never materialized
+    as one list; if it is missing, the whole response is decoded at once with the stdlib.
+    """
+    try:
+        import ijson
+    except ImportError:
+        logger.warning("ijson not available, decoding the full HIBP response at once")
+        ijson = None
+
+    try:
+        if ijson:
+            response.raw.decode_content = True # Let urllib3 undo gzip before ijson reads the bytes
+            yield from ijson.items(response.raw, "item")
+        else:
+            yield from response.json()
+    except Exception as e: # Includes JSONDecodeError and ijson errors raised mid-stream
+        # Re-raised so a truncated or invalid response fails the run instead of passing as a shorter one
+        logger.error(f"Error decoding JSON response from HIBP API: {e}")
+        raise
+
+
+def build_item_data(breach_entry: dict) -> dict | None:
+    """
+    Builds the scraped_items row for a single HIBP breach entry.
+    Returns None if the entry should be skipped.
+    Safe to run from worker threads (parse_date_hibp's cache is thread-safe).
+    """
+    try:
+        name = breach_entry.get("Name")
+        title = breach_entry.get("Title", name) # Use Name if Title is missing
+        domain = breach_entry.get("Domain")
+        breach_date_str = breach_entry.get("BreachDate") # Format: "YYYY-MM-DD"
+        added_date_str = breach_entry.get("AddedDate") # Format: "YYYY-MM-DDTHH:mm:ssZ"
+        modified_date_str = breach_entry.get("ModifiedDate") # Format: "YYYY-MM-DDTHH:mm:ssZ"
+        pwn_count = breach_entry.get("PwnCount")
+        description = breach_entry.get("Description")
+        data_classes = breach_entry.get("DataClasses", []) # Array of strings
+        
+        is_verified = breach_entry.get("IsVerified", False)
+        is_fabricated = breach_entry.get("IsFabricated", False)
+        is_sensitive = breach_entry.get("IsSensitive", False)
+        is_retired = breach_entry.get("IsRetired", False)
+        is_spam_list = breach_entry.get("IsSpamList", False)
+        logo_path = breach_entry.get("LogoPath") # URL to a logo image
+
+        if not name:
+            logger.warning("Skipping HIBP entry due to missing 'Name'. Entry: %s", breach_entry)
+            return None
+
+        # Construct item_url: https://haveibeenpwned.com/PwnedWebsites#[BreachName]
+        # The [BreachName] part needs to be URL-encoded if it contains special characters.
+        # However, HIBP uses the 'Name' directly as the anchor.
+        item_url = f"https://haveibeenpwned.com/PwnedWebsites#{quote(name)}"
+
+        publication_date_iso = parse_date_hibp(breach_date_str)
+        if not publication_date_iso:
+            logger.warning(f"Skipping HIBP entry '{name}' due to unparsable BreachDate: '{breach_date_str}'. Using AddedDate as fallback.")
+            publication_date_iso = parse_date_hibp(added_date_str) # Fallback to AddedDate
+            if not publication_date_iso:
+                logger.error(f"Critical: Could not parse BreachDate or AddedDate for HIBP entry '{name}'. Skipping.")
+                return None
+
+
+        raw_data = {
+            "hibp_name": name, # Store the original HIBP Name as it's an ID
+            "domain": domain,
+            "added_date_hibp": parse_date_hibp(added_date_str),
+            "modified_date_hibp": parse_date_hibp(modified_date_str),
+            "pwn_count": pwn_count,
+            "data_classes_hibp": data_classes,
+            "is_verified_hibp": is_verified,
+            "is_fabricated_hibp": is_fabricated,
+            "is_sensitive_hibp": is_sensitive,
+            "is_retired_hibp": is_retired,
+            "is_spam_list_hibp": is_spam_list,
+            "logo_path_hibp": logo_path
+        }
+        # Clean None values from raw_data
+        raw_data_json = {k: v for k, v in raw_data.items() if v is not None}
+
+
+        tags_set = set(_HIBP_BASE_TAGS) # A set keeps tags unique as they are added
+        if data_classes:
+            # Sanitize data classes for use as tags (lowercase, replace space with underscore)
+            tags_set.update(dc.translate(_TAG_TRANS).lower() for dc in data_classes)
+        tags_set.update(tag for flag, tag in _FLAG_TAGS.items() if breach_entry.get(flag))
+        tags = list(tags_set)
+
+
+        item_data = {
+            "source_id": SOURCE_ID_HIBP,
+            "item_url": item_url,
+            "title": title,
+            "publication_date": publication_date_iso,
+            "summary_text": description,
+            "raw_data_json": raw_data_json,
+            "tags_keywords": tags
+        }
+        return item_data
+
+    except Exception as e:
+        logger.warning("Error processing HIBP entry '%s': %s", breach_entry.get('Name', 'Unknown Name'), e)
+        return None
 
 def process_hibp_breaches():
     """
@@ -67,21 +271,15 @@ def process_hibp_breaches():
         logger.error(f"Failed to initialize Supabase client: {e}. Ensure SUPABASE_URL and SUPABASE_SERVICE_KEY are set.")
         return
 
-    headers = {
-        'hibp-api-key': hibp_api_key,
-        'User-Agent': USER_AGENT,
-        'Accept': 'application/json' # Expecting JSON response
-    }
+    session = get_session(hibp_api_key)
 
     api_url = HIBP_API_BASE_URL + HIBP_BREACHES_ENDPOINT
     
     logger.info(f"Requesting all breaches from HIBP API: {api_url}")
-    # Implement delay before API call as per HIBP guidelines
-    logger.info(f"Waiting for {HIBP_API_DELAY_SECONDS} seconds before making API call due to rate limits...")
-    time.sleep(HIBP_API_DELAY_SECONDS)
 
     try:
-        response = requests.get(api_url, headers=headers, timeout=60) # Increased timeout for potentially large response
+        # Streamed so entries can be parsed as they arrive; paced per HIBP guidelines
+        response = fetch_with_rate_limit(session, api_url, timeout=60, stream=True)
         
         if response.status_code == 401: # Unauthorized
             logger.error(f"HIBP API request failed with status 401 (Unauthorized). Check your HIBP_API_KEY. Response: {response.text}")
@@ -90,125 +288,44 @@ def process_hibp_breaches():
              logger.error(f"HIBP API request failed with status 403 (Forbidden). User agent not approved or other policy issue. Response: {response.text}")
              return
         elif response.status_code == 429: # Too Many Requests
-            logger.error(f"HIBP API request failed with status 429 (Too Many Requests). Rate limit exceeded. Retry later. Check 'retry-after' header if present: {response.headers.get('retry-after')}")
+            logger.error(f"HIBP API request failed with status 429 (Too Many Requests). Rate limit still exceeded after {HIBP_RATE_LIMIT_RETRIES} attempts. Retry later. Check 'retry-after' header if present: {response.headers.get('retry-after')}")
             return
             
         response.raise_for_status() # Raise an exception for other bad status codes (4xx or 5xx)
-        
-        breaches_data = response.json()
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching data from HIBP API ({api_url}): {e}", exc_info=True)
-        return
-    except ValueError as e_json: # Includes JSONDecodeError
-        logger.error(f"Error decoding JSON response from HIBP API ({api_url}): {e_json}. Response text: {response.text[:500]}")
-        return
-
-    if not breaches_data:
-        logger.info("No breach data returned from HIBP API.")
+        logger.exception(f"Error fetching data from HIBP API ({api_url}): {e}")
         return
 
-    logger.info(f"Successfully fetched {len(breaches_data)} breach entries from HIBP API.")
+    logger.info("Connected to HIBP API, streaming breach entries...")
 
     inserted_count = 0
     processed_count = 0
     skipped_count = 0
 
-    for breach_entry in breaches_data:
-        processed_count += 1
-        try:
-            name = breach_entry.get("Name")
-            title = breach_entry.get("Title", name) # Use Name if Title is missing
-            domain = breach_entry.get("Domain")
-            breach_date_str = breach_entry.get("BreachDate") # Format: "YYYY-MM-DD"
-            added_date_str = breach_entry.get("AddedDate") # Format: "YYYY-MM-DDTHH:mm:ssZ"
-            modified_date_str = breach_entry.get("ModifiedDate") # Format: "YYYY-MM-DDTHH:mm:ssZ"
-            pwn_count = breach_entry.get("PwnCount")
-            description = breach_entry.get("Description")
-            data_classes = breach_entry.get("DataClasses", []) # Array of strings
-            
-            is_verified = breach_entry.get("IsVerified", False)
-            is_fabricated = breach_entry.get("IsFabricated", False)
-            is_sensitive = breach_entry.get("IsSensitive", False)
-            is_retired = breach_entry.get("IsRetired", False)
-            is_spam_list = breach_entry.get("IsSpamList", False)
-            logo_path = breach_entry.get("LogoPath") # URL to a logo image
-
-            if not name:
-                logger.warning(f"Skipping HIBP entry due to missing 'Name'. Entry: {breach_entry}")
-                skipped_count += 1
-                continue
-
-            # Construct item_url: https://haveibeenpwned.com/PwnedWebsites#[BreachName]
-            # The [BreachName] part needs to be URL-encoded if it contains special characters.
-            # However, HIBP uses the 'Name' directly as the anchor.
-            item_url = f"https://haveibeenpwned.com/PwnedWebsites#{quote(name)}"
-
-            publication_date_iso = parse_date_hibp(breach_date_str)
-            if not publication_date_iso:
-                logger.warning(f"Skipping HIBP entry '{name}' due to unparsable BreachDate: '{breach_date_str}'. Using AddedDate as fallback.")
-                publication_date_iso = parse_date_hibp(added_date_str) # Fallback to AddedDate
-                if not publication_date_iso:
-                    logger.error(f"Critical: Could not parse BreachDate or AddedDate for HIBP entry '{name}'. Skipping.")
-                    skipped_count +=1
-                    continue
-
-
-            raw_data = {
-                "hibp_name": name, # Store the original HIBP Name as it's an ID
-                "domain": domain,
-                "added_date_hibp": parse_date_hibp(added_date_str),
-                "modified_date_hibp": parse_date_hibp(modified_date_str),
-                "pwn_count": pwn_count,
-                "data_classes_hibp": data_classes,
-                "is_verified_hibp": is_verified,
-                "is_fabricated_hibp": is_fabricated,
-                "is_sensitive_hibp": is_sensitive,
-                "is_retired_hibp": is_retired,
-                "is_spam_list_hibp": is_spam_list,
-                "logo_path_hibp": logo_path
-            }
-            # Clean None values from raw_data
-            raw_data_json = {k: v for k, v in raw_data.items() if v is not None}
-
-
-            tags = ["hibp", "data_breach"]
-            if data_classes:
-                # Sanitize data classes for use as tags (lowercase, replace space with underscore)
-                sanitized_data_classes = [dc.lower().replace(" ", "_").replace("'", "") for dc in data_classes]
-                tags.extend(sanitized_data_classes)
-            if is_verified: tags.append("verified_breach")
-            if is_sensitive: tags.append("sensitive_breach")
-            if is_fabricated: tags.append("fabricated_breach") # Unlikely to be useful but good to know
-            if is_retired: tags.append("retired_breach") # Data no longer searchable on HIBP
-            if is_spam_list: tags.append("spam_list")
-            
-            tags = list(set(tags)) # Ensure unique tags
-
-
-            item_data = {
-                "source_id": SOURCE_ID_HIBP,
-                "item_url": item_url,
-                "title": title,
-                "publication_date": publication_date_iso,
-                "summary_text": description,
-                "raw_data_json": raw_data_json,
-                "tags_keywords": tags
-            }
-            
-            # TODO: Implement check for existing record before inserting (e.g., by item_url or by HIBP Name in raw_data_json)
-            # Example: query_result = supabase_client.client.table("scraped_items").select("id").eq("raw_data_json->>hibp_name", name).eq("source_id", SOURCE_ID_HIBP).execute()
-            # if query_result.data: logger.info(f"HIBP item '{name}' already exists. Skipping."); skipped_count +=1; continue
-
-            insert_response = supabase_client.insert_item(**item_data)
-            if insert_response:
-                # logger.debug(f"Successfully inserted HIBP item for '{name}'.")
-                inserted_count += 1
-            else:
-                logger.error(f"Failed to insert HIBP item for '{name}'.")
-
-        except Exception as e:
-            logger.error(f"Error processing HIBP entry '{breach_entry.get('Name', 'Unknown Name')}': {e}", exc_info=True)
-            skipped_count +=1
+    # Build rows for each chunk of streamed entries in parallel, then write the chunk in one bulk upsert.
+    # The streamed response is closed once read, or if decoding fails part way through.
+    entries_stream = iter_breach_entries(response)
+    with response, ThreadPoolExecutor(max_workers=HIBP_PREPROCESS_WORKERS) as executor:
+        while True:
+            try:
+                entries = list(itertools.islice(entries_stream, HIBP_INSERT_BATCH_SIZE))
+            except Exception:
+                logger.error(f"HIBP run failed: response could not be fully decoded after {processed_count} entries ({inserted_count} inserted)")
+                raise
+            if not entries:
+                break
+            processed_count += len(entries)
+
+            batch = [item_data for item_data in executor.map(build_item_data, entries) if item_data is not None]
+            skipped_count += len(entries) - len(batch)
+
+            # Existing records (same item_url) are skipped by the upsert, so no per-row existence check is needed
+            if batch:
+                inserted_count += len(supabase_client.insert_items(batch, batch_size=HIBP_INSERT_BATCH_SIZE))
+
+    if processed_count == 0:
+        logger.info("No breach data returned from HIBP API.")
+        return
 
     logger.info(f"Finished processing HIBP breaches. Total entries: {processed_count}. Inserted: {inserted_count}. Skipped: {skipped_count}")
 
@@ -1,14 +1,22 @@
 import os
 import logging
+import json
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, date, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, date, timedelta, timezone
 from urllib.parse import urljoin
 from dateutil import parser as dateutil_parser
 import hashlib
 import re
 import io
 import time
+import functools
+import importlib
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Assuming SupabaseClient is in utils.supabase_client
 try:
@@ -25,54 +33,235 @@ logger = logging.getLogger(__name__)
 # Constants
 IOWA_AG_2025_URL = "https://www.iowaattorneygeneral.gov/for-consumers/security-breach-notifications/2025-security-breach-notification/"
 SOURCE_ID_IOWA_AG = 8
+IOWA_AG_SITE_ROOT = "https://www.iowaattorneygeneral.gov"  # Prefix for site-relative links
+IOWA_AG_TAGS = ["iowa_ag", "ia_breach", "2025"]  # Same for every row; cleaned into a fresh list on insert
 
 # Configuration from environment variables
 FILTER_FROM_DATE = os.environ.get("IA_AG_FILTER_FROM_DATE")  # Format: "YYYY-MM-DD"
 PROCESSING_MODE = os.environ.get("IA_AG_PROCESSING_MODE", "ENHANCED")  # BASIC, ENHANCED, FULL
 
+# Conditional-request cache (ETag / Last-Modified / content digest) so unchanged pages
+# skip parsing and inserts on scheduled re-runs
+PAGE_CACHE_FILE = os.environ.get(
+    "IA_AG_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'ia_ag.json')
+)
+
+# Bounds of the breach table in the raw page bytes
+TABLE_START_RE = re.compile(rb'<table[\s>]', re.IGNORECASE)
+TABLE_END_RE = re.compile(rb'</table\s*>', re.IGNORECASE)
+
+# Data rows of the breach table (header rows hold only <th> cells)
+TABLE_ROW_SELECTOR = 'tbody > tr:has(td)'
+
+# Link text marking a supplemental (follow-up) notice rather than the primary letter
+SUPPLEMENTAL_LINK_RE = re.compile(r'supplemental', re.IGNORECASE)
+
+# Patterns for the number of affected individuals in notice text (first match wins)
+AFFECTED_INDIVIDUALS_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d{1,3}(?:,\d{3})*)\s*(?:individuals?|people|persons?|residents?|customers?|patients?|members?)',
+    r'(?:affecting|affected|impacted)\s*(\d{1,3}(?:,\d{3})*)',
+    r'(\d{1,3}(?:,\d{3})*)\s*(?:iowa\s*)?(?:residents?|individuals?)',
+))
+
+# Headings that introduce the "what information was involved" section
+WHAT_INFO_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'what\s+(?:information|data)\s+(?:was\s+)?(?:involved|affected|compromised|accessed|disclosed)',
+    r'types?\s+of\s+(?:information|data)\s+(?:involved|affected|compromised)',
+    r'personal\s+information\s+(?:involved|affected|compromised)',
+    r'information\s+(?:that\s+)?(?:may\s+have\s+been\s+)?(?:involved|affected|compromised|accessed)'
+))
+
+# Characters kept after a "what information was involved" heading
+WHAT_INFO_CHARS = 500
+
+# Placeholder values in the date column that mean "no date"
+DATE_SENTINELS = frozenset({'', 'n/a', 'unknown', 'pending', 'various', 'see notice', 'not provided', 'ongoing'})
+
+# The date format the Iowa AG table uses (e.g. "1-7-2025"), parsed without dateutil
+IA_DATE_RE = re.compile(r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})$')
+
+# One shared dateutil parser instance instead of the module-level default lookup per call
+DATE_PARSER = dateutil_parser.parser()
+
 # Headers for requests
 REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Only advertise Brotli when a decoder is installed, otherwise urllib3 can't decompress it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
 # Rate limiting
-RATE_LIMIT_DELAY = 2  # seconds between requests
+RATE_LIMIT_DELAY = 0.25  # Minimum seconds between request starts to the AG site (4 req/s)
+RETRY_STATUS_CODES = (429, 502, 503, 504)  # Transient statuses retried with exponential backoff
+RETRY_BACKOFF_FACTOR = 0.3  # Backoff is factor * 2**attempt seconds unless Retry-After says otherwise
+MAX_RETRIES = 3
+_last_request_ts = None  # time.monotonic() of the last rate-limited request
 
-def rate_limit_delay():
-    """Add delay between requests to be respectful to the server."""
-    time.sleep(RATE_LIMIT_DELAY)
+# PDF analysis
+PDF_FETCH_CONCURRENCY = 4  # Simultaneous PDF downloads; kept low to stay polite to the AG site
+PDF_PARSE_WORKERS = os.cpu_count() or 1  # Worker processes for CPU-bound text extraction
+PDF_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk while streaming a PDF
+MAX_PDF_BYTES = 20 * 1024 * 1024  # Notices are a few pages; anything larger is skipped
+
+# Database configuration
+INSERT_BATCH_SIZE = 100  # Rows per bulk insert request
+INSERT_MAX_WORKERS = 4  # Bulk insert requests sent concurrently
+
+class PdfTooLargeError(ValueError):
+    """Raised when a notice PDF is larger than MAX_PDF_BYTES."""
+
+# Shared session so the page and PDF requests reuse the same keep-alive connections
+_session = None
+
+# Shared process pool for PDF parsing, created on first use
+_pdf_executor = None
 
-def parse_date_flexible_ia(date_str: str) -> str | None:
+def get_session() -> requests.Session:
     """
-    Parse Iowa AG date strings (format: M-D-YYYY) to ISO 8601 format.
-    Returns ISO 8601 format string or None if parsing fails.
+    Get or create a persistent session with pooled keep-alive connections,
+    compressed transfers and automatic retries on transient errors.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(REQUEST_HEADERS)
+        _session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        retries = Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUS_CODES)
+        # Nearly all traffic goes to the AG host, so a few pools with deep keep-alive queues suffice
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+        logger.info("Created new Iowa AG session")
+    return _session
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Get or create the process pool that runs CPU-bound PDF text extraction.
+    Workers come from a forkserver where available: the pool first starts workers from
+    inside the aiohttp event loop, and forking a process that has resolver threads
+    running can deadlock the child.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('forkserver')
+        else:
+            mp_context = None
+        _pdf_executor = ProcessPoolExecutor(max_workers=PDF_PARSE_WORKERS, mp_context=mp_context)
+    return _pdf_executor
+
+def close_pdf_executor():
+    """Shut down the PDF worker processes."""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown()
+        _pdf_executor = None
+
+def close_session():
+    """Close the shared session's pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+def load_page_cache() -> dict:
+    """
+    Load the cached validators from the last fully successful run.
+    Returns an empty dict if there is no cache or it was written with different settings.
     """
-    if not date_str or date_str.strip().lower() in ['n/a', 'unknown', 'pending', 'various', 'see notice', 'not provided', 'ongoing']:
-        return None
     try:
-        # Iowa AG uses M-D-YYYY format (e.g., "1-7-2025", "1-16-2025")
-        dt_object = dateutil_parser.parse(date_str.strip())
-        return dt_object.isoformat()
-    except (ValueError, TypeError, OverflowError) as e:
-        logger.warning(f"Could not parse Iowa AG date string: '{date_str}'. Error: {e}")
-        return None
+        with open(PAGE_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    # A different filter date or processing mode can produce different rows from the same page
+    if cache.get('filter_from_date') != FILTER_FROM_DATE or cache.get('processing_mode') != PROCESSING_MODE:
+        return {}
+    return cache
+
+def save_page_cache(response: requests.Response, content_digest: str):
+    """
+    Persist the page validators so the next run can send a conditional request.
+    """
+    cache = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_digest': content_digest,
+        'filter_from_date': FILTER_FROM_DATE,
+        'processing_mode': PROCESSING_MODE,
+        'ts': time.time()
+    }
+    try:
+        os.makedirs(os.path.dirname(PAGE_CACHE_FILE), exist_ok=True)
+        with open(PAGE_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning(f"Could not write Iowa AG page cache {PAGE_CACHE_FILE}: {e}")
+
+def resolve_link_ia(href: str) -> str:
+    """
+    Resolve a link from the breach table to an absolute URL.
+    Absolute, site-relative and plain page-relative hrefs (every row in practice) are
+    handled with string concatenation; dot segments, protocol-relative links, other
+    schemes and query/fragment-only links go through urljoin.
+    """
+    if href.startswith(('http://', 'https://')):
+        return href
+    if href.startswith(('.', '#', '?', '//')) or '/.' in href or ':' in href.split('/', 1)[0]:
+        return urljoin(IOWA_AG_2025_URL, href)
+    if href.startswith('/'):
+        return IOWA_AG_SITE_ROOT + href
+    return IOWA_AG_2025_URL + href  # The page URL ends with '/', so relative paths append
 
-def parse_date_to_date_only(date_str: str) -> str | None:
+def rate_limit_delay():
+    """
+    Sleep only for whatever remains of RATE_LIMIT_DELAY since the last request,
+    so time spent downloading and parsing counts towards the gap.
     """
-    Parse date string and return only the date part (YYYY-MM-DD).
+    global _last_request_ts
+    if _last_request_ts is not None:
+        wait = RATE_LIMIT_DELAY - (time.monotonic() - _last_request_ts)
+        if wait > 0:
+            time.sleep(wait)
+    _last_request_ts = time.monotonic()
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_ia(date_str: str) -> date | None:
     """
-    if not date_str:
+    Parse an Iowa AG date string to a date, memoized for the run.
+    The site's M-D-YYYY format (e.g. "1-7-2025") is built directly; anything else, or a
+    match that isn't a valid M-D date (e.g. day-first "31-1-2025"), goes through dateutil.
+    Returns None for placeholders and unparsable strings.
+    """
+    date_str = date_str.strip()
+    if date_str.lower() in DATE_SENTINELS:
         return None
+    match = IA_DATE_RE.match(date_str)
+    if match:
+        month, day, year = map(int, match.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            pass
     try:
-        dt_object = dateutil_parser.parse(date_str.strip())
-        return dt_object.date().isoformat()
-    except (ValueError, TypeError, OverflowError):
+        return DATE_PARSER.parse(date_str).date()
+    except (ValueError, TypeError, OverflowError) as e:
+        logger.warning("Could not parse Iowa AG date string: '%s'. Error: %s", date_str, e)
         return None
 
+@functools.lru_cache(maxsize=2048)
 def generate_incident_uid_ia(organization_name: str, reported_date: str) -> str:
     """
     Generate a unique incident identifier for Iowa AG breaches.
     Format: IA_AG_2025_{hash}
+    The hash is part of every stored item_url, so it must stay MD5 to keep deduplication working.
     """
     # Create a unique string from organization name and date
     unique_string = f"iowa_ag_2025_{organization_name.lower().strip()}_{reported_date}"
@@ -81,28 +270,26 @@ def generate_incident_uid_ia(organization_name: str, reported_date: str) -> str:
     short_hash = hash_object.hexdigest()[:8]
     return f"IA_AG_2025_{short_hash.upper()}"
 
-def should_process_record_ia(reported_date_str: str) -> bool:
+def parse_filter_date_ia(filter_from_date: str | None) -> date | None:
     """
-    Determine if a breach record should be processed based on date filtering.
+    Parse the FILTER_FROM_DATE setting (YYYY-MM-DD). An invalid value falls back to one week back.
     """
-    if not FILTER_FROM_DATE:
-        return True
-
+    if not filter_from_date:
+        return None
     try:
-        filter_date = datetime.strptime(FILTER_FROM_DATE, "%Y-%m-%d").date()
-
-        # Parse the reported date
-        parsed_date = parse_date_to_date_only(reported_date_str)
-        if parsed_date:
-            record_date = datetime.strptime(parsed_date, "%Y-%m-%d").date()
-            return record_date >= filter_date
+        return datetime.strptime(filter_from_date, '%Y-%m-%d').date()
+    except ValueError:
+        logger.warning("Invalid FILTER_FROM_DATE format '%s', using one week back", filter_from_date)
+        return date.today() - timedelta(days=7)
 
-        # If no valid date found, include the record
-        return True
+FILTER_DATE = parse_filter_date_ia(FILTER_FROM_DATE)
 
-    except Exception as e:
-        logger.warning(f"Error in date filtering: {e}")
-        return True
+def should_process_record_ia(reported_date: date | None) -> bool:
+    """
+    Determine if a breach record should be processed based on date filtering.
+    Records without a valid date are included.
+    """
+    return FILTER_DATE is None or reported_date is None or reported_date >= FILTER_DATE
 
 def extract_affected_individuals_ia(text: str) -> int | None:
     """
@@ -111,33 +298,116 @@ def extract_affected_individuals_ia(text: str) -> int | None:
     if not text:
         return None
 
-    # Common patterns for affected individuals
-    patterns = [
-        r'(\d{1,3}(?:,\d{3})*)\s*(?:individuals?|people|persons?|residents?|customers?|patients?|members?)',
-        r'(?:affecting|affected|impacted)\s*(\d{1,3}(?:,\d{3})*)',
-        r'(\d{1,3}(?:,\d{3})*)\s*(?:iowa\s*)?(?:residents?|individuals?)',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        if matches:
+    for pattern in AFFECTED_INDIVIDUALS_PATTERNS:
+        match = pattern.search(text)
+        if match:
             try:
                 # Remove commas and convert to int
-                number_str = matches[0].replace(',', '')
+                number_str = match.group(1).replace(',', '')
                 return int(number_str)
             except (ValueError, IndexError):
                 continue
 
     return None
 
-def analyze_pdf_content_ia(pdf_url: str) -> dict:
+def iter_pages_with_pdfium_ia(pdf_bytes: bytes):
     """
-    Enhanced PDF content analysis for comprehensive breach details (Tier 3).
-    Extracts affected individuals, data types, and incident details from Iowa AG PDFs.
+    Yield the text of each PDF page using pypdfium2.
     """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
     try:
-        logger.info(f"Analyzing Iowa AG PDF: {pdf_url}")
+        for i in range(len(pdf)):
+            yield pdf[i].get_textpage().get_text_range()
+    finally:
+        pdf.close()
+
+def iter_pages_with_pdfplumber_ia(pdf_bytes: bytes):
+    """
+    Yield the text of each PDF page using pdfplumber.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ''
+
+def iter_pages_with_pypdf2_ia(pdf_bytes: bytes):
+    """
+    Yield the text of each PDF page using PyPDF2.
+    """
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ''
+
+# Page-text extractors in order of preference: PDFium (C) first, the pure-Python libraries as fallbacks.
+# Pages are produced lazily so analysis can stop once it has found what it needs.
+PDF_TEXT_EXTRACTORS = (
+    ('pypdfium2', iter_pages_with_pdfium_ia),
+    ('pdfplumber', iter_pages_with_pdfplumber_ia),
+    ('PyPDF2', iter_pages_with_pypdf2_ia),
+)
+
+@functools.lru_cache(maxsize=None)
+def available_pdf_extractors_ia() -> tuple:
+    """
+    The PDF_TEXT_EXTRACTORS whose library is installed, decided once per process
+    so missing libraries don't cost a failed import on every PDF.
+    """
+    available = []
+    for name, extractor in PDF_TEXT_EXTRACTORS:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.debug("%s not available for PDF extraction", name)
+            continue
+        available.append((name, extractor))
+    return tuple(available)
+
+def iter_pdf_pages_ia(pdf_bytes: bytes):
+    """
+    Yield page texts from the first installed extractor that produces any text.
+    An extractor that fails before producing text hands over to the next one;
+    one that fails part-way ends the document with the pages read so far.
+    Raises ImportError if none of the PDF libraries is installed.
+    """
+    extractors = available_pdf_extractors_ia()
+    if not extractors:
+        raise ImportError("None of pypdfium2, pdfplumber or PyPDF2 is installed")
+
+    for name, iter_pages in extractors:
+        produced_text = False
+        try:
+            for page_text in iter_pages(pdf_bytes):
+                produced_text = produced_text or bool(page_text.strip())
+                yield page_text
+        except Exception as e:
+            logger.debug("%s extraction failed: %s", name, e)
+        if produced_text:
+            logger.debug("%s extraction successful", name)
+            return
 
+def find_what_info_ia(text: str) -> int | None:
+    """
+    Offset just past the first "what information was involved" heading (in pattern
+    priority order) that is followed by some text, or None if there is none yet.
+    """
+    for pattern in WHAT_INFO_PATTERNS:
+        match = pattern.search(text)
+        if match and text[match.end():match.end() + WHAT_INFO_CHARS].strip():
+            return match.end()
+    return None
+
+def parse_pdf_content_ia(pdf_url: str, pdf_bytes: bytes) -> dict:
+    """
+    Enhanced PDF content analysis for comprehensive breach details (Tier 3).
+    Extracts affected individuals, data types, and incident details from a downloaded Iowa AG PDF.
+    CPU-bound and free of shared state, so it can run in a worker process.
+    """
+    try:
         pdf_analysis = {
             'pdf_analyzed': True,
             'pdf_url': pdf_url,
@@ -147,119 +417,325 @@ def analyze_pdf_content_ia(pdf_url: str) -> dict:
             'extraction_confidence': 'low'  # Track confidence in extraction
         }
 
-        # Add rate limiting delay before PDF request
-        rate_limit_delay()
-
-        # Extract PDF content using local libraries (PyPDF2 and pdfplumber)
         try:
-            response = requests.get(pdf_url, headers=REQUEST_HEADERS, timeout=30)
-            response.raise_for_status()
-
-            if response.status_code == 200:
-                # Try PyPDF2 first
-                try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(response.content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-                    text_content = ""
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content += page_text + "\n"
-
-                    if text_content.strip():
-                        # Clean the extracted text to prevent Unicode errors in database
-                        text_content = clean_text_for_database(text_content)
-                        content = text_content.lower()
-                        pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
-                        pdf_analysis['extraction_confidence'] = 'high'
-                        logger.debug(f"PyPDF2 extraction successful for {pdf_url}")
-                    else:
-                        raise Exception("No text extracted from PDF with PyPDF2")
-
-                except ImportError:
-                    logger.debug("PyPDF2 not available, trying pdfplumber")
-                    raise Exception("PyPDF2 not available")
-
-                except Exception as pypdf_error:
-                    logger.debug(f"PyPDF2 extraction failed: {pypdf_error}, trying pdfplumber")
-
-                    # Try pdfplumber as alternative
-                    try:
-                        import pdfplumber
-                        pdf_file = io.BytesIO(response.content)
-
-                        text_content = ""
-                        with pdfplumber.open(pdf_file) as pdf:
-                            for page in pdf.pages:
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text_content += page_text + "\n"
-
-                        if text_content.strip():
-                            # Clean the extracted text to prevent Unicode errors in database
-                            text_content = clean_text_for_database(text_content)
-                            content = text_content.lower()
-                            pdf_analysis['raw_text'] = text_content[:1000]  # Store sample
-                            pdf_analysis['extraction_confidence'] = 'high'
-                            logger.debug(f"pdfplumber extraction successful for {pdf_url}")
-                        else:
-                            raise Exception("No text extracted from PDF with pdfplumber")
-
-                    except ImportError:
-                        logger.warning("Neither PyPDF2 nor pdfplumber available for PDF extraction")
-                        pdf_analysis['extraction_confidence'] = 'failed'
-                        return pdf_analysis
-
-                    except Exception as pdfplumber_error:
-                        logger.warning(f"Both PyPDF2 and pdfplumber failed for {pdf_url}: {pdfplumber_error}")
-                        pdf_analysis['extraction_confidence'] = 'failed'
-                        return pdf_analysis
-
-                # Extract affected individuals
-                affected_individuals = extract_affected_individuals_ia(text_content)
-                if affected_individuals:
-                    pdf_analysis['affected_individuals'] = affected_individuals
-
-                # Extract "what information was involved" section
-                what_info_patterns = [
-                    r'what\s+(?:information|data)\s+(?:was\s+)?(?:involved|affected|compromised|accessed|disclosed)',
-                    r'types?\s+of\s+(?:information|data)\s+(?:involved|affected|compromised)',
-                    r'personal\s+information\s+(?:involved|affected|compromised)',
-                    r'information\s+(?:that\s+)?(?:may\s+have\s+been\s+)?(?:involved|affected|compromised|accessed)'
-                ]
-
-                for pattern in what_info_patterns:
-                    match = re.search(pattern, content)
-                    if match:
-                        # Extract text after the pattern (next 500 characters)
-                        start_pos = match.end()
-                        extracted_text = text_content[start_pos:start_pos + 500].strip()
-                        if extracted_text:
-                            pdf_analysis['what_information_involved']['text'] = extracted_text
-                            break
-
-                logger.info(f"Successfully analyzed PDF: {pdf_url}")
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Failed to download PDF {pdf_url}: {e}")
-            pdf_analysis['extraction_confidence'] = 'failed'
+            # Read pages until both fields are found (notices usually state them on the first page or two)
+            text_content = ""
+            affected_individuals = None
+            what_info_start = None
+            try:
+                for page_text in iter_pdf_pages_ia(pdf_bytes):
+                    # Clean the extracted text to prevent Unicode errors in database
+                    text_content += clean_text_for_database(page_text) + "\n"
+
+                    if affected_individuals is None:
+                        affected_individuals = extract_affected_individuals_ia(text_content)
+                    if what_info_start is None:
+                        what_info_start = find_what_info_ia(text_content)
+
+                    if (affected_individuals is not None and what_info_start is not None
+                            and len(text_content) >= what_info_start + WHAT_INFO_CHARS):
+                        break
+            except ImportError:
+                logger.warning("No PDF library (pypdfium2, pdfplumber, PyPDF2) available for PDF extraction")
+                pdf_analysis['extraction_confidence'] = 'failed'
+                return pdf_analysis
+
+            if not text_content.strip():
+                logger.warning("No text extracted from PDF %s", pdf_url)
+                pdf_analysis['extraction_confidence'] = 'failed'
+                return pdf_analysis
+
+            if PROCESSING_MODE == "FULL":
+                pdf_analysis['raw_text'] = text_content[:1000]  # Store sample (FULL mode only, it's ~1KB per row)
+            pdf_analysis['extraction_confidence'] = 'high'
+
+            if affected_individuals:
+                pdf_analysis['affected_individuals'] = affected_individuals
+
+            # Extract "what information was involved" section (the text after the heading)
+            if what_info_start is not None:
+                extracted_text = text_content[what_info_start:what_info_start + WHAT_INFO_CHARS].strip()
+                pdf_analysis['what_information_involved']['text'] = extracted_text
+
+            logger.info("Successfully analyzed PDF: %s", pdf_url)
 
         except Exception as e:
-            logger.warning(f"Error analyzing PDF {pdf_url}: {e}")
+            logger.warning("Error analyzing PDF %s: %s", pdf_url, e)
             pdf_analysis['extraction_confidence'] = 'failed'
 
         return pdf_analysis
 
     except Exception as e:
-        logger.error(f"Critical error in PDF analysis for {pdf_url}: {e}")
-        return {
-            'pdf_analyzed': False,
-            'pdf_url': pdf_url,
-            'error': str(e),
-            'extraction_confidence': 'failed'
-        }
+        logger.error("Critical error in PDF analysis for %s: %s", pdf_url, e)
+        return pdf_failure_ia(pdf_url, e)
+
+def pdf_failure_ia(pdf_url: str, error: Exception) -> dict:
+    """Tier 3 record for a PDF that could not be downloaded or analyzed."""
+    return {
+        'pdf_analyzed': False,
+        'pdf_url': pdf_url,
+        'error': str(error),
+        'extraction_confidence': 'failed'
+    }
+
+def analyze_pdf_content_ia(pdf_url: str) -> dict:
+    """
+    Download one Iowa AG PDF with the shared session and analyze it in-process.
+    """
+    logger.info("Analyzing Iowa AG PDF: %s", pdf_url)
+
+    # Add rate limiting delay before PDF request
+    rate_limit_delay()
+
+    try:
+        with get_session().get(pdf_url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            pdf_bytes = read_pdf_body_ia(response.iter_content(PDF_CHUNK_SIZE), response.headers.get('Content-Length'))
+    except (requests.exceptions.RequestException, PdfTooLargeError) as e:
+        logger.warning("Failed to download PDF %s: %s", pdf_url, e)
+        return pdf_failure_ia(pdf_url, e)
+
+    return parse_pdf_content_ia(pdf_url, pdf_bytes)
+
+def read_pdf_body_ia(chunks, content_length: str | None = None) -> bytes:
+    """
+    Collect a streamed PDF body, giving up as soon as it exceeds MAX_PDF_BYTES
+    (or up front if Content-Length already says so) instead of buffering it whole.
+    """
+    if content_length and content_length.isdigit() and int(content_length) > MAX_PDF_BYTES:
+        raise PdfTooLargeError(f"PDF is {content_length} bytes, limit is {MAX_PDF_BYTES}")
+
+    buffer = io.BytesIO()
+    for chunk in chunks:
+        buffer.write(chunk)
+        if buffer.tell() > MAX_PDF_BYTES:
+            raise PdfTooLargeError(f"PDF exceeds {MAX_PDF_BYTES} bytes")
+    return buffer.getvalue()
+
+async def read_pdf_body_async_ia(response) -> bytes:
+    """
+    aiohttp counterpart of read_pdf_body_ia().
+    """
+    content_length = response.headers.get('Content-Length')
+    if content_length and content_length.isdigit() and int(content_length) > MAX_PDF_BYTES:
+        raise PdfTooLargeError(f"PDF is {content_length} bytes, limit is {MAX_PDF_BYTES}")
+
+    buffer = io.BytesIO()
+    async for chunk in response.content.iter_chunked(PDF_CHUNK_SIZE):
+        buffer.write(chunk)
+        if buffer.tell() > MAX_PDF_BYTES:
+            raise PdfTooLargeError(f"PDF exceeds {MAX_PDF_BYTES} bytes")
+    return buffer.getvalue()
+
+async def _analyze_pdfs_aiohttp(pdf_urls: list, executor) -> dict:
+    """
+    Download PDFs concurrently over one keep-alive aiohttp session and hand each one to
+    the executor for parsing as soon as it arrives, so extraction overlaps the downloads.
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    headers = {**REQUEST_HEADERS, 'Accept-Encoding': ACCEPT_ENCODING}
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit_per_host=PDF_FETCH_CONCURRENCY, keepalive_timeout=30)
+
+    # Only PDF_FETCH_CONCURRENCY downloads are in flight at once, so the request timeout
+    # starts when a connection is free rather than while a download waits in the pool queue
+    fetch_slots = asyncio.Semaphore(PDF_FETCH_CONCURRENCY)
+
+    # Space request starts RATE_LIMIT_DELAY apart while letting the downloads themselves overlap
+    rate_lock = asyncio.Lock()
+    last_request = None
+
+    async def wait_for_turn():
+        nonlocal last_request
+        async with rate_lock:
+            if last_request is not None:
+                wait = RATE_LIMIT_DELAY - (loop.time() - last_request)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            last_request = loop.time()
+
+    async with aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector) as session:
+        async def download(pdf_url):
+            for attempt in range(MAX_RETRIES + 1):
+                async with fetch_slots:
+                    await wait_for_turn()
+                    async with session.get(pdf_url) as response:
+                        if response.status not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                            response.raise_for_status()
+                            return await read_pdf_body_async_ia(response)
+                        retry_after = response.headers.get('Retry-After', '')
+
+                # Back off without blocking the other downloads
+                delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF_FACTOR * 2 ** attempt
+                logger.info("Got %d for %s, retrying in %.1fs", response.status, pdf_url, delay)
+                await asyncio.sleep(delay)
+
+        async def analyze_one(pdf_url):
+            try:
+                pdf_bytes = await download(pdf_url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, PdfTooLargeError) as e:
+                logger.warning("Failed to download PDF %s: %s", pdf_url, e)
+                return pdf_url, pdf_failure_ia(pdf_url, e)
+
+            logger.info("Analyzing Iowa AG PDF: %s", pdf_url)
+            try:
+                return pdf_url, await loop.run_in_executor(executor, parse_pdf_content_ia, pdf_url, pdf_bytes)
+            except BrokenProcessPool as e:
+                logger.warning("PDF worker process died while analyzing %s: %s", pdf_url, e)
+                return pdf_url, pdf_failure_ia(pdf_url, e)
+
+        return dict(await asyncio.gather(*(analyze_one(pdf_url) for pdf_url in pdf_urls)))
+
+def analyze_pdfs_ia(pdf_urls: list) -> dict:
+    """
+    Download and analyze a batch of Iowa AG PDFs, returning {url: tier 3 analysis}.
+    Downloads run concurrently with aiohttp and parsing is spread over a process pool,
+    since text extraction is CPU-bound. Without aiohttp, PDFs are fetched one at a time
+    with the shared rate-limited session.
+    """
+    pdf_urls = list(dict.fromkeys(pdf_urls))  # De-duplicate, keeping order
+    if not pdf_urls:
+        return {}
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        logger.info("aiohttp not available, analyzing %d PDFs sequentially", len(pdf_urls))
+        return {pdf_url: analyze_pdf_content_ia(pdf_url) for pdf_url in pdf_urls}
+
+    try:
+        executor = get_pdf_executor()
+    except (OSError, NotImplementedError) as e:
+        # Process pools can be unavailable in restricted environments; use the loop's thread pool instead
+        logger.warning("PDF process pool unavailable (%s), parsing in threads", e)
+        executor = None
+
+    return asyncio.run(_analyze_pdfs_aiohttp(pdf_urls, executor))
+
+def apply_pdf_analysis_ia(db_item: dict, pdf_analysis: dict) -> None:
+    """
+    Merge a tier 3 PDF analysis into a pending database item.
+    """
+    raw_data = db_item['raw_data_json']
+    raw_data["tier_3_pdf_analysis"].append(pdf_analysis)
+    raw_data["tier_2_enhanced"]["enhancement_attempted"] = True
+
+    if pdf_analysis.get('error'):
+        logger.warning("PDF analysis failed for '%s': %s", db_item['title'], pdf_analysis['error'])
+        raw_data["tier_2_enhanced"]["enhancement_errors"].append(f"PDF analysis failed: {pdf_analysis['error']}")
+
+    # Extract enhanced data from PDF analysis
+    if pdf_analysis.get('affected_individuals'):
+        db_item['affected_individuals'] = pdf_analysis['affected_individuals']
+
+    # Extract what information was involved (the PDF URL stays as the fallback)
+    what_info = pdf_analysis.get('what_information_involved', {})
+    if what_info.get('text'):
+        db_item['what_was_leaked'] = what_info['text']
+
+def _iter_table_rows_lexbor(html: bytes):
+    """
+    Yield breach table rows parsed with selectolax's Lexbor parser (C HTML5 parser, no per-node Python objects).
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    main_table = tree.css_first('table')
+    if main_table is None:
+        return
+
+    # Lexbor builds an HTML5 tree, so rows always sit in a <tbody> even when the markup omits it.
+    # One query covers both layouts and drops header rows (which have only <th> cells).
+    for row in main_table.css(TABLE_ROW_SELECTOR):
+        cols = row.css('td')
+        cell_texts = [col.text(strip=True) for col in cols]
+        links = [(a.attributes.get('href'), a.text(strip=True)) for a in cols[1].css('a[href]')] if len(cols) > 1 else []
+        yield cell_texts, links
+
+def _node_text(element) -> str:
+    """
+    Text of an lxml element with each text part stripped, matching get_text(strip=True).
+    """
+    return ''.join(part.strip() for part in element.itertext())
+
+@functools.lru_cache(maxsize=None)
+def _row_xpaths_ia() -> tuple:
+    """
+    XPath queries for a table row's cells and its organization-cell links,
+    compiled once per run (lxml is imported lazily since it's only the fallback backend).
+    """
+    from lxml import etree
+
+    return etree.XPath('td'), etree.XPath('td[2]//a[@href]')
+
+def _iter_table_rows_iterparse(html: bytes):
+    """
+    Yield breach table rows as lxml.etree.iterparse streams through the page
+    (fallback when selectolax isn't installed). Each <tr> is cleared as soon as it
+    has been read, so peak memory doesn't grow with the page.
+    """
+    from lxml import etree
+
+    cells_xpath, links_xpath = _row_xpaths_ia()
+    main_table = None
+
+    # The site serves UTF-8; say so explicitly since the table fragment has no <meta charset>
+    for event, elem in etree.iterparse(io.BytesIO(html), events=('start', 'end'), tag=('table', 'tr'), html=True, encoding='utf-8'):
+        if elem.tag == 'table':
+            if event == 'start' and main_table is None:
+                main_table = elem
+            elif event == 'end' and elem is main_table:
+                break  # Only the first table holds breach notifications
+            continue
+
+        if event != 'end' or main_table is None or next(elem.iterancestors('table'), None) is not main_table:
+            continue
+
+        # Header rows have only <th> cells, matching TABLE_ROW_SELECTOR
+        cols = cells_xpath(elem)
+        if cols:
+            cell_texts = [_node_text(col) for col in cols]
+            links = [(a.get('href'), _node_text(a)) for a in links_xpath(elem)]
+            yield cell_texts, links
+
+        # Free the processed row and any already-processed siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def extract_table_rows_ia(html: bytes):
+    """
+    Extract the rows of the Iowa AG breach table.
+    Returns an iterator of (cell_texts, links) tuples, where links are (href, text) pairs
+    from the organization cell, or None if the page has no table. Rows are produced
+    as they are parsed, so the caller can process and drop each one in turn.
+    """
+    html = table_fragment_ia(html)
+    if TABLE_START_RE.search(html) is None:
+        return None
+
+    try:
+        import selectolax.lexbor  # noqa: F401
+    except ImportError:
+        logger.debug("selectolax not available, stream-parsing with lxml")
+        return _iter_table_rows_iterparse(html)
+    return _iter_table_rows_lexbor(html)
+
+def table_fragment_ia(html: bytes) -> bytes:
+    """
+    Cut the page down to its first <table>...</table> so the parsers only build the table,
+    not the site's navigation, header and footer. Returns the page unchanged if there is
+    no table or the table contains a nested one (where the first </table> isn't the end).
+    """
+    start = TABLE_START_RE.search(html)
+    if start is None:
+        return html
+    end = TABLE_END_RE.search(html, start.end())
+    if end is None or TABLE_START_RE.search(html, start.end(), end.start()):
+        return html
+    return html[start.start():end.end()]
 
 def process_iowa_ag_breaches_2025():
     """
@@ -268,34 +744,47 @@ def process_iowa_ag_breaches_2025():
     """
     logger.info("Starting Enhanced Iowa AG 2025 Security Breach Notification processing...")
 
-    # Filter configuration
-    if FILTER_FROM_DATE:
-        try:
-            filter_date = datetime.strptime(FILTER_FROM_DATE, '%Y-%m-%d').date()
-            logger.info(f"Date filtering enabled: collecting breaches from {filter_date} onward")
-        except ValueError:
-            logger.warning(f"Invalid FILTER_FROM_DATE format '{FILTER_FROM_DATE}', using one week back")
-            filter_date = (date.today() - timedelta(days=7))
+    # Filter configuration (FILTER_DATE is parsed once at import)
+    if FILTER_DATE is not None:
+        logger.info("Date filtering enabled: collecting breaches from %s onward", FILTER_DATE)
     else:
-        filter_date = None
         logger.info("Testing mode: collecting ALL 2025 breach data (no date filtering)")
 
+    # Send conditional headers from the last successful run so an unchanged page returns 304
+    page_cache = load_page_cache()
+    conditional_headers = {}
+    if page_cache.get('etag'):
+        conditional_headers['If-None-Match'] = page_cache['etag']
+    if page_cache.get('last_modified'):
+        conditional_headers['If-Modified-Since'] = page_cache['last_modified']
+
     try:
-        response = requests.get(IOWA_AG_2025_URL, headers=REQUEST_HEADERS, timeout=30)
+        response = get_session().get(IOWA_AG_2025_URL, headers=conditional_headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching Iowa AG 2025 breach data page: {e}")
         return
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    if response.status_code == 304:
+        logger.info("Iowa AG 2025 page not modified since last successful run. Nothing to do.")
+        return
+
+    # Fallback for servers that don't send validators: compare a digest of the page body
+    content_digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+    if content_digest == page_cache.get('content_digest'):
+        logger.info("Iowa AG 2025 page content unchanged since last successful run. Nothing to do.")
+        return
+
+    # One timestamp for every row of this run, taken when the page was fetched
+    fetched_at_utc = datetime.now(timezone.utc).isoformat()
 
     # Iowa AG 2025 site structure: Simple table with two columns
     # Find the main table containing breach notifications
-    main_table = soup.find('table')
+    table_rows = extract_table_rows_ia(response.content)
 
-    if not main_table:
+    if table_rows is None:
         logger.error("Could not find main table for 2025 breach notifications. Page structure might have changed.")
-        logger.debug(f"Page content sample (first 1000 chars): {response.text[:1000]}")
+        logger.debug("Page content sample (first 1000 chars): %.1000s", response.text)
         return
 
     logger.info("Found main table for 2025 breach notifications.")
@@ -310,31 +799,15 @@ def process_iowa_ag_breaches_2025():
     inserted_count = 0
     processed_count = 0
     skipped_count = 0
-
-    # Extract table rows (skip header row)
-    tbody = main_table.find('tbody')
-    if not tbody:
-        # Some tables might just have <tr> directly under <table>
-        table_rows = main_table.find_all('tr')
-        # Remove header row if present (first <tr> with <th>)
-        if table_rows and table_rows[0].find_all('th'):
-            table_rows = table_rows[1:]
-    else:
-        table_rows = tbody.find_all('tr')
-
-    if not table_rows:
-        logger.info("No breach notification rows found in 2025 table.")
-        return
-
-    logger.info(f"Found {len(table_rows)} potential breach notifications in 2025 table.")
+    pending_inserts = []  # db_items collected for the concurrent bulk insert after parsing
+    had_errors = False  # Only cache the page if every row made it to the database
 
     # Process each table row
-    for row_idx, row in enumerate(table_rows):
+    for row_idx, (cell_texts, links) in enumerate(table_rows):
         processed_count += 1
-        cols = row.find_all('td')
 
-        if len(cols) < 2:  # Need at least Date Reported and Organization Name
-            logger.warning(f"Skipping row {row_idx+1} due to insufficient columns ({len(cols)}). Content: {[c.get_text(strip=True)[:30] for c in cols]}")
+        if len(cell_texts) < 2:  # Need at least Date Reported and Organization Name
+            logger.warning("Skipping row %d due to insufficient columns (%d). Content: %s", row_idx + 1, len(cell_texts), [text[:30] for text in cell_texts])
             skipped_count += 1
             continue
 
@@ -342,21 +815,23 @@ def process_iowa_ag_breaches_2025():
             # Extract basic data from table columns
             # Column 0: Date Reported
             # Column 1: Organization Name (with PDF links)
-            date_reported_str = cols[0].get_text(strip=True)
-            organization_cell = cols[1]  # Cell contains organization name and PDF links
+            date_reported_str = cell_texts[0]
 
-            # Extract organization name (clean text without links)
-            organization_name = organization_cell.get_text(strip=True)
+            # Extract organization name (cell text, which also contains the PDF link text)
+            organization_name = cell_texts[1]
 
             # Extract all PDF links from the organization cell
             pdf_links = []
             supplemental_links = []
 
-            for link_tag in organization_cell.find_all('a', href=True):
-                link_url = urljoin(IOWA_AG_2025_URL, link_tag['href'])
-                link_text = link_tag.get_text(strip=True)
+            # Link texts are part of the cell text, so one search on the cell tells us whether
+            # any link can be supplemental; most rows have none and skip the per-link checks
+            has_supplemental = SUPPLEMENTAL_LINK_RE.search(organization_name) is not None
 
-                if 'supplemental' in link_text.lower():
+            for href, link_text in links:
+                link_url = resolve_link_ia(href)
+
+                if has_supplemental and SUPPLEMENTAL_LINK_RE.search(link_text):
                     supplemental_links.append({
                         'url': link_url,
                         'text': link_text,
@@ -379,41 +854,39 @@ def process_iowa_ag_breaches_2025():
 
             # Skip if we don't have essential data
             if not organization_name or not date_reported_str or not primary_pdf_url:
-                logger.warning(f"Skipping row {row_idx+1} due to missing essential data: org='{organization_name}', date='{date_reported_str}', pdf='{primary_pdf_url}'")
+                logger.warning("Skipping row %d due to missing essential data: org='%s', date='%s', pdf='%s'", row_idx + 1, organization_name, date_reported_str, primary_pdf_url)
                 skipped_count += 1
                 continue
 
+            # Parse the reported date once; ISO strings are only produced for the database fields
+            reported_date = parse_date_ia(date_reported_str)
+
             # Apply date filtering
-            if not should_process_record_ia(date_reported_str):
-                logger.info(f"Skipping '{organization_name}' - reported date {date_reported_str} is before filter date")
+            if not should_process_record_ia(reported_date):
+                logger.info("Skipping '%s' - reported date %s is before filter date", organization_name, date_reported_str)
                 skipped_count += 1
                 continue
 
-            # Parse dates
-            publication_date_iso = parse_date_flexible_ia(date_reported_str)
-            if not publication_date_iso:
-                logger.warning(f"Skipping '{organization_name}' due to unparsable reported date: '{date_reported_str}'")
+            if reported_date is None:
+                logger.warning("Skipping '%s' due to unparsable reported date: '%s'", organization_name, date_reported_str)
                 skipped_count += 1
                 continue
 
-            reported_date_only = parse_date_to_date_only(date_reported_str)
+            reported_date_only = reported_date.isoformat()
+            publication_date_iso = f"{reported_date_only}T00:00:00"
 
             # Generate incident UID for deduplication
-            incident_uid = generate_incident_uid_ia(organization_name, reported_date_only or date_reported_str)
+            incident_uid = generate_incident_uid_ia(organization_name, reported_date_only)
 
-            # Check if item already exists
+            # Existing items are filtered out in one batched lookup after the loop
             unique_url = f"{IOWA_AG_2025_URL}#{incident_uid}"
-            if supabase_client.check_item_exists(unique_url):
-                logger.info(f"Item already exists for '{organization_name}' on {date_reported_str}. Skipping.")
-                skipped_count += 1
-                continue
 
             # Build 3-tier data structure
             raw_data = {
                 # Tier 1: Portal Data (Raw extraction from table)
                 "tier_1_portal_data": {
                     "source_url": IOWA_AG_2025_URL,
-                    "extraction_timestamp": datetime.now().isoformat(),
+                    "extraction_timestamp": fetched_at_utc,
                     "table_row_index": row_idx,
                     "raw_date_reported": date_reported_str,
                     "raw_organization_name": organization_name,
@@ -426,8 +899,8 @@ def process_iowa_ag_breaches_2025():
                 # Tier 2: Derived/enrichment (computed fields)
                 "tier_2_enhanced": {
                     "incident_uid": incident_uid,
-                    "portal_first_seen_utc": datetime.now().isoformat(),
-                    "portal_last_seen_utc": datetime.now().isoformat(),
+                    "portal_first_seen_utc": fetched_at_utc,
+                    "portal_last_seen_utc": fetched_at_utc,
                     "has_supplemental_documents": len(supplemental_links) > 0,
                     "total_documents": len(pdf_links) + len(supplemental_links),
                     "enhancement_attempted": False,
@@ -438,50 +911,22 @@ def process_iowa_ag_breaches_2025():
                 "tier_3_pdf_analysis": []
             }
 
-            # Initialize variables for enhanced data
-            affected_individuals = None
-            what_was_leaked_value = None
-
-            # Perform PDF analysis based on processing mode
-            if PROCESSING_MODE in ["ENHANCED", "FULL"] and primary_pdf_url:
-                try:
-                    pdf_analysis = analyze_pdf_content_ia(primary_pdf_url)
-                    raw_data["tier_3_pdf_analysis"].append(pdf_analysis)
-                    raw_data["tier_2_enhanced"]["enhancement_attempted"] = True
-
-                    # Extract enhanced data from PDF analysis
-                    if pdf_analysis.get('affected_individuals'):
-                        affected_individuals = pdf_analysis['affected_individuals']
-
-                    # Extract what information was involved
-                    what_info = pdf_analysis.get('what_information_involved', {})
-                    if what_info.get('text'):
-                        what_was_leaked_value = what_info['text']
-                    else:
-                        # Fallback to PDF URL if no text extracted
-                        what_was_leaked_value = primary_pdf_url
-
-                except Exception as e:
-                    logger.warning(f"PDF analysis failed for '{organization_name}': {e}")
-                    raw_data["tier_2_enhanced"]["enhancement_errors"].append(f"PDF analysis failed: {str(e)}")
-                    what_was_leaked_value = primary_pdf_url  # Fallback to PDF URL
-            else:
-                # In BASIC mode, just use PDF URL as fallback
-                what_was_leaked_value = primary_pdf_url
-
             # Build summary
-            summary = f"Security breach notification for {organization_name} reported to Iowa AG on {date_reported_str}."
-            if len(supplemental_links) > 0:
-                summary += f" Includes {len(supplemental_links)} supplemental document(s)."
+            summary_parts = [f"Security breach notification for {organization_name} reported to Iowa AG on {date_reported_str}."]
+            if supplemental_links:
+                summary_parts.append(f"Includes {len(supplemental_links)} supplemental document(s).")
+            summary = ' '.join(summary_parts)
 
             # Build full content
-            full_content = f"Organization: {organization_name}\n"
-            full_content += f"Date Reported to Iowa AG: {date_reported_str}\n"
-            full_content += f"Primary Document: {primary_pdf_url}\n"
+            content_lines = [
+                f"Organization: {organization_name}",
+                f"Date Reported to Iowa AG: {date_reported_str}",
+                f"Primary Document: {primary_pdf_url}",
+            ]
             if supplemental_links:
-                full_content += f"Supplemental Documents: {len(supplemental_links)}\n"
-                for supp in supplemental_links:
-                    full_content += f"  - {supp['text']}: {supp['url']}\n"
+                content_lines.append(f"Supplemental Documents: {len(supplemental_links)}")
+                content_lines.extend(f"  - {supp['text']}: {supp['url']}" for supp in supplemental_links)
+            full_content = '\n'.join(content_lines) + '\n'
 
             # Prepare database item
             db_item = {
@@ -492,29 +937,65 @@ def process_iowa_ag_breaches_2025():
                 'summary_text': summary,
                 'full_content': full_content,
                 'reported_date': reported_date_only,
-                'affected_individuals': affected_individuals,
+                'affected_individuals': None,  # Filled in from the PDF analysis below
                 'notice_document_url': primary_pdf_url,
-                'what_was_leaked': what_was_leaked_value,
-                'tags_keywords': ["iowa_ag", "ia_breach", "2025"],
+                'what_was_leaked': primary_pdf_url,  # PDF URL unless the analysis finds the section text
+                'tags_keywords': IOWA_AG_TAGS,
                 'raw_data_json': {
                     'scraper_version': '1.0_enhanced_iowa_ag_2025',
                     **raw_data
                 }
             }
 
-            # Insert into database
-            insert_response = supabase_client.insert_item(**db_item)
-            if insert_response:
-                logger.info(f"Successfully inserted item for '{organization_name}' reported on {date_reported_str}. URL: {unique_url}")
-                inserted_count += 1
-            else:
-                logger.error(f"Failed to insert item for '{organization_name}' reported on {date_reported_str}")
+            # Queue for the existence check and bulk insert
+            pending_inserts.append(db_item)
 
         except Exception as e:
-            logger.error(f"Error processing row for '{organization_name if 'organization_name' in locals() else 'Unknown Organization'}': {row.text[:150]}. Error: {e}", exc_info=True)
+            logger.error("Error processing row for '%s': %.150s. Error: %s", organization_name if 'organization_name' in locals() else 'Unknown Organization', ' '.join(cell_texts), e, exc_info=True)
             skipped_count += 1
+            had_errors = True
+
+    if not processed_count:
+        logger.info("No breach notification rows found in 2025 table.")
+        return
 
-    logger.info(f"Finished processing Iowa AG breaches. Total items processed: {processed_count}. Items inserted: {inserted_count}. Items skipped: {skipped_count}")
+    logger.info("Found %d potential breach notifications in 2025 table.", processed_count)
+
+    # Check which rows are already stored with a few batched queries instead of one per row
+    if pending_inserts:
+        candidate_urls = [db_item['item_url'] for db_item in pending_inserts]
+        try:
+            existing_urls = supabase_client.get_existing_item_urls_among(candidate_urls)
+        except Exception as e:
+            logger.warning("Could not batch-check existing items, falling back to per-row checks: %s", e)
+            existing_urls = {url for url in candidate_urls if supabase_client.check_item_exists(url)}
+
+        new_items = []
+        for db_item in pending_inserts:
+            if db_item['item_url'] in existing_urls:
+                logger.info("Item already exists for '%s' on %s. Skipping.", db_item['title'], db_item['reported_date'])
+                skipped_count += 1
+            else:
+                new_items.append(db_item)
+        pending_inserts = new_items
+
+    # Analyze the notice PDFs of all new rows together instead of one blocking download per row
+    if PROCESSING_MODE in ["ENHANCED", "FULL"] and pending_inserts:
+        pdf_analyses = analyze_pdfs_ia([db_item['notice_document_url'] for db_item in pending_inserts])
+        for db_item in pending_inserts:
+            apply_pdf_analysis_ia(db_item, pdf_analyses[db_item['notice_document_url']])
+
+    # The page holds one year of notices, so all rows are inserted at once with concurrent batches
+    if pending_inserts:
+        inserted_count += len(supabase_client.insert_items(
+            pending_inserts, batch_size=INSERT_BATCH_SIZE, max_workers=INSERT_MAX_WORKERS
+        ))
+        had_errors = had_errors or inserted_count < len(pending_inserts)
+
+    if not had_errors:
+        save_page_cache(response, content_digest)
+
+    logger.info("Finished processing Iowa AG breaches. Total items processed: %d. Items inserted: %d. Items skipped: %d", processed_count, inserted_count, skipped_count)
 
 if __name__ == "__main__":
     logger.info("Enhanced Iowa AG 2025 Security Breach Scraper Started")
@@ -532,6 +1013,10 @@ if __name__ == "__main__":
         else:
             logger.info("Date filtering disabled - collecting all 2025 data")
 
-        process_iowa_ag_breaches_2025()
+        try:
+            process_iowa_ag_breaches_2025()
+        finally:
+            close_session()
+            close_pdf_executor()
 
     logger.info("Enhanced Iowa AG 2025 Security Breach Scraper Finished")
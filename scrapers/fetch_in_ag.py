@@ -1,13 +1,20 @@
 import os
 import re
-import io
+import tempfile
 import logging
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from datetime import datetime, date, timezone
 from urllib.parse import urljoin
 from dateutil import parser as dateutil_parser
 import time
+import functools
+import importlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Assuming SupabaseClient is in utils.supabase_client
 try:
@@ -23,12 +30,45 @@ logger = logging.getLogger(__name__)
 
 # Enhanced Constants for Indiana AG
 INDIANA_AG_BREACH_URL = "https://www.in.gov/attorneygeneral/2874.htm"
+INDIANA_AG_SITE_ROOT = "https://www.in.gov"  # Prefix for site-relative links
+INDIANA_AG_BASE_DIR = "https://www.in.gov/attorneygeneral/"  # Directory the page-relative links resolve against
 SOURCE_ID_INDIANA_AG = 7
+INDIANA_AG_TAGS = ("indiana_ag", "in_breach", "data_breach")  # Plus a per-year tag
+INDIANA_AG_KEYWORDS = ["indiana", "breach", "notification", "attorney_general"]  # Same for every record; cleaned into a fresh list on insert
 
 # Configuration from environment variables
 FILTER_FROM_DATE = os.environ.get("IN_AG_FILTER_FROM_DATE")  # Format: YYYY-MM-DD
 PROCESSING_MODE = os.environ.get("IN_AG_PROCESSING_MODE", "ENHANCED")  # BASIC, ENHANCED, FULL
 
+# Year of a yearly report, taken from its link text or filename
+YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+# Placeholder values in date cells that mean "no date"
+DATE_SENTINELS = frozenset({'', 'n/a', 'unknown', 'pending', 'various', 'see notice', 'not provided', 'ongoing'})
+
+# The common date cell format (e.g. "1/7/2025"), parsed without dateutil
+IN_DATE_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+
+# Other known date formats, tried with strptime before falling back to dateutil
+IN_DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y")
+
+# Main content area of the index page as (tag, attribute, token), newest layout first
+CONTENT_AREAS = (
+    ('section', 'id', 'content_container_324572'),
+    ('div', 'id', 'contentcontainer'),
+    ('article', 'class', 'main-content'),
+)
+
+# Markers of an affected-individuals cell with no real count, matched in one pass over the lowercased cell
+NON_NUMERIC_RE = re.compile(r'unknown|n/a|pending|investigating|tbd')
+
+# Words that mark a PDF table row as a header row, matched in one pass
+HEADER_ROW_RE = re.compile(r'organization|entity|company|date|breach|affected|notification|report', re.IGNORECASE)
+
+# Numbers in an affected-individuals cell, in one alternation:
+# group 1 is comma-grouped ("1,234"), group 2 is plain ("500")
+NUMBER_RE = re.compile(r'\b(\d{1,3}(?:,\d{3})+)\b|\b(\d+)\b')
+
 # Headers for requests
 REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -37,33 +77,145 @@ REQUEST_HEADERS = {
 # Rate limiting
 RATE_LIMIT_DELAY = 2  # seconds between requests
 
-def rate_limit_delay():
-    """Add rate limiting delay between requests."""
-    time.sleep(RATE_LIMIT_DELAY)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)  # Transient statuses retried with exponential backoff
+RETRY_BACKOFF_FACTOR = 0.5
+MAX_RETRIES = 3
 
-def parse_date_flexible_in(date_str: str) -> str | None:
+HTML_CHUNK_SIZE = 64 * 1024  # Bytes fed to the HTML parser per read
+PDF_CHUNK_SIZE = 64 * 1024  # Bytes written to disk per read while streaming a PDF
+
+# pdfplumber's table detection is pure Python, so large PDFs are split across processes
+PDF_PARSE_WORKERS = os.cpu_count() or 1
+PDF_PAGES_PER_TASK = 4  # Pages whose tables one worker task extracts
+
+INSERT_BATCH_SIZE = 100  # Rows per bulk insert request
+INSERT_MAX_WORKERS = 4  # Bulk insert requests sent concurrently
+
+# Shared HTTP session and PDF worker pool, created on first use
+_session = None
+_pdf_executor = None
+_last_request_ts = None  # time.monotonic() of the last rate-limited request
+
+def get_session() -> requests.Session:
     """
-    Enhanced date parsing for Indiana AG breach data.
-    Returns ISO 8601 format string or None if parsing fails.
+    Get or create a persistent session so the index page and PDF fetches reuse one
+    keep-alive connection, with automatic retries on transient errors.
     """
-    if not date_str or date_str.strip().lower() in ['n/a', 'unknown', 'pending', 'various', 'see notice', 'not provided', 'ongoing']:
-        return None
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(REQUEST_HEADERS)
+        retries = Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUS_CODES)
+        adapter = HTTPAdapter(max_retries=retries)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+        logger.info("Created new Indiana AG session")
+    return _session
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Get or create the process pool that extracts PDF tables.
+    Workers come from a forkserver where available, so they don't inherit copies of
+    the session's and Supabase client's open sockets.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('forkserver')
+        else:
+            mp_context = None
+        _pdf_executor = ProcessPoolExecutor(max_workers=PDF_PARSE_WORKERS, mp_context=mp_context)
+    return _pdf_executor
+
+def close_pdf_executor():
+    """Shut down the PDF worker processes."""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown()
+        _pdf_executor = None
+
+def close_session():
+    """Close the shared session's pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+def resolve_link_in(href: str) -> str:
+    """
+    Resolve a report link from the index page to an absolute URL.
+    Absolute, site-relative and plain page-relative hrefs are handled with string
+    concatenation; dot segments, protocol-relative links, other schemes and
+    query/fragment-only links go through urljoin.
+    """
+    if href.startswith(('http://', 'https://')):
+        return href
+    if href.startswith(('.', '#', '?', '//')) or '/.' in href or ':' in href.split('/', 1)[0]:
+        return urljoin(INDIANA_AG_BREACH_URL, href)
+    if href.startswith('/'):
+        return INDIANA_AG_SITE_ROOT + href
+    return INDIANA_AG_BASE_DIR + href
 
+def rate_limit_delay():
+    """
+    Sleep only for whatever remains of RATE_LIMIT_DELAY since the last request,
+    so time spent downloading and parsing counts towards the gap.
+    """
+    global _last_request_ts
+    if _last_request_ts is not None:
+        wait = RATE_LIMIT_DELAY - (time.monotonic() - _last_request_ts)
+        if wait > 0:
+            time.sleep(wait)
+    _last_request_ts = time.monotonic()
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_in(date_str: str) -> datetime | None:
+    """
+    Parse an Indiana AG date string to a datetime, or None if parsing fails.
+    Cached, since the same dates repeat across rows and are parsed again by the date filter.
+    """
     # Clean the date string
-    date_str = date_str.strip()
+    date_str = date_str.strip() if date_str else ''
+    if date_str.lower() in DATE_SENTINELS:
+        return None
+
+    # Fast paths for M/D/YYYY and the other known formats; anything else
+    # (or an impossible date) falls back to dateutil
+    match = IN_DATE_RE.fullmatch(date_str)
+    if match:
+        month, day, year = match.groups()
+        try:
+            return datetime(int(year), int(month), int(day))
+        except ValueError:
+            pass
+    else:
+        for date_format in IN_DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, date_format)
+            except ValueError:
+                continue
 
     try:
-        # Handle common Indiana AG date formats
-        dt_object = dateutil_parser.parse(date_str)
-        return dt_object.isoformat()
+        # Handle any other Indiana AG date formats
+        return dateutil_parser.parse(date_str)
     except (ValueError, TypeError, OverflowError) as e:
-        logger.warning(f"Could not parse date string: '{date_str}'. Error: {e}")
+        logger.warning("Could not parse date string: '%s'. Error: %s", date_str, e)
         return None
 
+def parse_date_flexible_in(date_str: str) -> str | None:
+    """
+    Enhanced date parsing for Indiana AG breach data.
+    Returns ISO 8601 format string or None if parsing fails.
+    """
+    dt_object = parse_date_in(date_str)
+    return dt_object.isoformat() if dt_object else None
+
+@functools.lru_cache(maxsize=4096)
 def extract_affected_individuals_in(text: str) -> int | None:
     """
     Extract number of affected individuals from text.
     Handles various formats like "1,234", "approximately 500", "up to 1000", etc.
+    Cached, since empty and small counts repeat across rows.
     """
     if not text:
         return None
@@ -72,33 +224,21 @@ def extract_affected_individuals_in(text: str) -> int | None:
     text = text.lower().strip()
 
     # Skip non-numeric indicators
-    if any(skip_word in text for skip_word in ['unknown', 'n/a', 'pending', 'investigating', 'tbd']):
+    if NON_NUMERIC_RE.search(text):
         return None
 
-    # Extract numbers using regex - handle both comma-separated and simple numbers
-    # First try to find comma-separated numbers (like "1,234" or "10,000")
-    comma_pattern = r'\b(\d{1,3}(?:,\d{3})+)\b'
-    comma_matches = re.findall(comma_pattern, text)
-    if comma_matches:
-        try:
-            # Convert comma-separated numbers
-            numbers = [int(match.replace(',', '')) for match in comma_matches]
-            return max(numbers)
-        except ValueError:
-            pass
-
-    # If no comma-separated numbers, look for simple numbers
-    simple_pattern = r'\b(\d+)\b'
-    simple_matches = re.findall(simple_pattern, text)
-    if simple_matches:
-        try:
-            # Take the largest number found (often the most relevant)
-            numbers = [int(match) for match in simple_matches]
-            return max(numbers)
-        except ValueError:
-            pass
+    # Extract numbers in one regex pass - comma-separated numbers (like "1,234" or "10,000")
+    # win over simple numbers, and the largest number found is often the most relevant
+    comma_numbers = []
+    simple_numbers = []
+    for comma_match, simple_match in NUMBER_RE.findall(text):
+        if comma_match:
+            comma_numbers.append(int(comma_match.replace(',', '')))
+        else:
+            simple_numbers.append(int(simple_match))
 
-    return None
+    numbers = comma_numbers or simple_numbers
+    return max(numbers) if numbers else None
 
 def generate_incident_uid_in(year: str, index: int) -> str:
     """
@@ -107,6 +247,59 @@ def generate_incident_uid_in(year: str, index: int) -> str:
     """
     return f"IN-AG-{year}-{index:03d}"
 
+class _ReportLinkCollector:
+    """
+    lxml parser target that keeps only the PDF links inside the page's content areas.
+    close() returns the (href, link_text) pairs of the first content area of the
+    highest-priority kind in CONTENT_AREAS, or None if the page has none of them.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._open_areas = []  # (rank, depth) of the content areas enclosing the current element
+        self._links = {}  # rank -> (href, link_text) pairs of the first content area of that kind
+        self._link = None  # (href, stripped text parts) of the PDF link being read
+        self._text = []  # raw pieces of the current text node inside that link
+
+    def _flush_text(self):
+        # Strip whole text nodes, matching BeautifulSoup's get_text(strip=True)
+        if self._text:
+            self._link[1].append(''.join(self._text).strip())
+            self._text = []
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        for rank, (area_tag, attribute, token) in enumerate(CONTENT_AREAS):
+            if tag == area_tag and rank not in self._links and token in attrib.get(attribute, '').split():
+                self._links[rank] = []
+                self._open_areas.append((rank, self._depth))
+                break
+
+        if self._link is not None:
+            self._flush_text()
+        elif tag == 'a' and self._open_areas and attrib.get('href', '').lower().endswith('.pdf'):
+            self._link = (attrib['href'], [])
+
+    def data(self, text):
+        if self._link is not None:
+            self._text.append(text)
+
+    def end(self, tag):
+        if self._link is not None:
+            self._flush_text()
+            if tag == 'a':
+                link = (self._link[0], ''.join(self._link[1]))
+                for rank, _ in self._open_areas:
+                    self._links[rank].append(link)
+                self._link = None
+
+        if self._open_areas and self._open_areas[-1][1] == self._depth:
+            self._open_areas.pop()
+        self._depth -= 1
+
+    def close(self):
+        return self._links[min(self._links)] if self._links else None
+
 def get_yearly_pdf_urls() -> dict:
     """
     Extract yearly PDF URLs from the main Indiana AG breach page.
@@ -114,34 +307,28 @@ def get_yearly_pdf_urls() -> dict:
     """
     try:
         logger.info("Fetching yearly PDF URLs from Indiana AG breach page...")
-        response = requests.get(INDIANA_AG_BREACH_URL, headers=REQUEST_HEADERS, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Find the content area - updated for current page structure
-        content_area = soup.find('section', id='content_container_324572')
-        if not content_area:
-            content_area = soup.find('div', id='contentcontainer')
-            if not content_area:
-                content_area = soup.find('article', class_='main-content')
-                if not content_area:
-                    logger.error("Could not find main content area on Indiana AG page")
-                    return {}
+        rate_limit_delay()
+        # Feed the page to the parser as it arrives; the target keeps only the content-area
+        # PDF links, so no tree is built for the rest of the page
+        parser = etree.HTMLParser(target=_ReportLinkCollector())
+        with get_session().get(INDIANA_AG_BREACH_URL, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=HTML_CHUNK_SIZE):
+                parser.feed(chunk)
+        pdf_links = parser.close()
+
+        if pdf_links is None:
+            logger.error("Could not find main content area on Indiana AG page")
+            return {}
 
         # Find all PDF links with year patterns
         pdf_urls = {}
-        pdf_links = content_area.find_all('a', href=lambda href: href and href.lower().endswith('.pdf'))
-
-        for link in pdf_links:
-            href = link.get('href', '')
-            link_text = link.get_text(strip=True)
-
-            # Extract year from link text or filename
-            year_match = re.search(r'\b(20\d{2})\b', link_text + ' ' + href)
+        for href, link_text in pdf_links:
+            # Extract year from link text, else from the filename
+            year_match = YEAR_RE.search(link_text) or YEAR_RE.search(href)
             if year_match:
                 year = year_match.group(1)
-                full_url = urljoin(INDIANA_AG_BREACH_URL, href)
+                full_url = resolve_link_in(href)
                 pdf_urls[year] = full_url
                 logger.info(f"Found PDF for year {year}: {full_url}")
 
@@ -152,119 +339,142 @@ def get_yearly_pdf_urls() -> dict:
         logger.error(f"Error fetching yearly PDF URLs: {e}")
         return {}
 
-def parse_pdf_table_data(pdf_url: str, year: str) -> list:
+@functools.lru_cache(maxsize=None)
+def pdfplumber_available_in() -> bool:
     """
-    Parse tabular breach data from Indiana AG yearly PDF reports.
-    Returns list of breach records extracted from the PDF.
+    Whether pdfplumber is installed, decided once per process instead of by a
+    failed import on every PDF.
     """
     try:
-        logger.info(f"Parsing PDF table data for year {year}: {pdf_url}")
+        importlib.import_module('pdfplumber')
+    except ImportError:
+        return False
+    return True
+
+def _extract_tables_from_pages_in(pdf_path: str, page_numbers: range) -> list:
+    """
+    Extract the tables of the given pages as (page_index, tables) pairs.
+    Runs in a PDF worker process, so it opens its own copy of the document.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(page_num, pdf.pages[page_num].extract_tables()) for page_num in page_numbers]
+
+def extract_page_tables_in(pdf_path: str) -> list:
+    """
+    Extract every page's tables as (page_index, tables) pairs in page order.
+    With several workers and enough pages, page ranges are extracted in parallel
+    on the PDF process pool; otherwise everything runs in this process.
+    Requires pdfplumber; check pdfplumber_available_in() first.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        if PDF_PARSE_WORKERS < 2 or page_count <= PDF_PAGES_PER_TASK:
+            return [(page_num, page.extract_tables()) for page_num, page in enumerate(pdf.pages)]
 
-        # Add rate limiting
+    page_ranges = [
+        range(start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+    results = get_pdf_executor().map(_extract_tables_from_pages_in, itertools.repeat(pdf_path), page_ranges)
+    return [page_tables for result in results for page_tables in result]
+
+def fetch_pdf_in(pdf_url: str) -> str | None:
+    """
+    Stream a yearly PDF report to a temporary file, so the report is never held in
+    memory whole; the parsers (and the PDF workers) read it from disk by path.
+    Returns the file path, or None if the download fails. The caller removes the file.
+    """
+    pdf_path = None
+    try:
         rate_limit_delay()
+        with get_session().get(pdf_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            with tempfile.NamedTemporaryFile(prefix='in_ag_', suffix='.pdf', delete=False) as pdf_file:
+                pdf_path = pdf_file.name
+                for chunk in response.iter_content(chunk_size=PDF_CHUNK_SIZE):
+                    pdf_file.write(chunk)
+        return pdf_path
+    except (requests.RequestException, OSError) as e:
+        logger.error(f"Error downloading PDF {pdf_url}: {e}")
+        if pdf_path:
+            os.remove(pdf_path)
+        return None
 
-        # Download PDF
-        response = requests.get(pdf_url, headers=REQUEST_HEADERS, timeout=60)
-        response.raise_for_status()
+def parse_pdf_table_data(pdf_path: str, pdf_url: str, year: str) -> list:
+    """
+    Parse tabular breach data from an Indiana AG yearly PDF report that has already
+    been downloaded to pdf_path, so parsing never waits on the network.
+    Returns list of breach records extracted from the PDF.
+    """
+    if not pdfplumber_available_in():
+        logger.error(f"pdfplumber is not installed, cannot extract tables from {pdf_url}")
+        return []
+
+    try:
+        logger.info(f"Parsing PDF table data for year {year}: {pdf_url}")
 
         breach_records = []
 
-        # Try pdfplumber first (better for tables)
-        try:
-            import pdfplumber
-            pdf_file = io.BytesIO(response.content)
-
-            with pdfplumber.open(pdf_file) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    # Extract tables from the page
-                    tables = page.extract_tables()
-
-                    for table in tables:
-                        if not table:
-                            continue
-
-                        # Process table rows
-                        for row_idx, row in enumerate(table):
-                            if not row or len(row) < 3:  # Skip incomplete rows
-                                continue
-
-                            # Skip header rows and invalid data
-                            row_text = ' '.join(str(cell) for cell in row if cell).lower()
-                            if any(header in row_text for header in ['organization', 'entity', 'company', 'date', 'breach', 'affected', 'notification', 'report']):
-                                continue
-
-                            # Skip rows where first column is just a number (row numbers)
-                            if len(row) > 1 and str(row[0]).strip().isdigit() and len(str(row[0]).strip()) < 4:
-                                # This looks like a row number, use the corrected column mapping
-                                pass
-                            elif not str(row[0]).strip().isdigit():
-                                # This might be old format, skip for now
-                                continue
-
-                            # Extract breach record data - CORRECT COLUMN MAPPING
-                            # Based on PDF visual inspection, the actual column order is:
-                            # Column 0: ROW NO (Row Number - skip)
-                            # Column 1: Matter:Name (Organization Name)
-                            # Column 2: Notific Sent (Notification Sent Date)
-                            # Column 3: Breach Occ (Breach Occurred Date)
-                            # Column 4: IN Affected (Indiana Residents Affected)
-                            # Column 5: Total Affected (Total People Affected Across All States)
-                            record = {
-                                'organization_name': str(row[1]).strip() if len(row) > 1 and row[1] else '',
-                                'notification_sent_date': str(row[2]).strip() if len(row) > 2 and row[2] else '',
-                                'breach_date': str(row[3]).strip() if len(row) > 3 and row[3] else '',
-                                'indiana_affected': str(row[4]).strip() if len(row) > 4 and row[4] else '',
-                                'total_affected': str(row[5]).strip() if len(row) > 5 and row[5] else '',
-                                'pdf_url': pdf_url,
-                                'year': year,
-                                'page_number': page_num + 1,
-                                'row_index': row_idx
-                            }
-
-                            # Validate record has essential data
-                            if record['organization_name'] and record['organization_name'] not in ['None', 'null', '']:
-                                breach_records.append(record)
-                                logger.debug(f"Valid record found: {record['organization_name']} - IN: {record['indiana_affected']}, Total: {record['total_affected']}")
-                            else:
-                                logger.debug(f"Skipped invalid record: {record}")
-
-        except ImportError:
-            logger.warning("pdfplumber not available, trying PyPDF2...")
-            # Fallback to PyPDF2 (less reliable for tables)
-            try:
-                import PyPDF2
-                pdf_file = io.BytesIO(response.content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-                full_text = ""
-                for page in pdf_reader.pages:
-                    full_text += page.extract_text() + "\n"
-
-                # Simple text parsing for table-like data
-                lines = full_text.split('\n')
-                for line_idx, line in enumerate(lines):
-                    line = line.strip()
-                    if not line or len(line) < 10:
+        # Extract tables from every page (across worker processes for large PDFs)
+        for page_num, tables in extract_page_tables_in(pdf_path):
+            for table in tables:
+                if not table:
+                    continue
+
+                # Process table rows
+                for row_idx, row in enumerate(table):
+                    if not row or len(row) < 3:  # Skip incomplete rows
                         continue
 
-                    # Look for lines that might contain breach data
-                    # This is a simplified approach and may need refinement
-                    if any(keyword in line.lower() for keyword in ['corp', 'inc', 'llc', 'company', 'hospital', 'medical']):
-                        record = {
-                            'organization_name': line[:50],  # First part likely org name
-                            'breach_date': '',
-                            'reported_date': '',
-                            'affected_individuals': '',
-                            'information_compromised': line,
-                            'pdf_url': pdf_url,
-                            'year': year,
-                            'page_number': 1,
-                            'row_index': line_idx
-                        }
-                        breach_records.append(record)
+                    # Skip header rows and invalid data
+                    # pdfplumber cells are strings or None, so empty cells just need filtering out
+                    row_text = ' '.join(filter(None, row))
+                    if HEADER_ROW_RE.search(row_text):
+                        continue
 
-            except Exception as e:
-                logger.error(f"PyPDF2 parsing failed: {e}")
+                    # Strip every cell once and pad to the six mapped columns so they can be unpacked
+                    padded = [str(cell).strip() if cell else '' for cell in row]
+                    padded += [''] * (6 - len(padded))
+                    first_cell, org_name, notification_sent, breach_date, in_affected, total_affected = padded[:6]
+
+                    # Skip rows where first column is just a number (row numbers)
+                    if first_cell.isdigit() and len(first_cell) < 4:
+                        # This looks like a row number, use the corrected column mapping
+                        pass
+                    elif not first_cell.isdigit():
+                        # This might be old format, skip for now
+                        continue
+
+                    # Extract breach record data - CORRECT COLUMN MAPPING
+                    # Based on PDF visual inspection, the actual column order is:
+                    # Column 0: ROW NO (Row Number - skip)
+                    # Column 1: Matter:Name (Organization Name)
+                    # Column 2: Notific Sent (Notification Sent Date)
+                    # Column 3: Breach Occ (Breach Occurred Date)
+                    # Column 4: IN Affected (Indiana Residents Affected)
+                    # Column 5: Total Affected (Total People Affected Across All States)
+                    record = {
+                        'organization_name': org_name,
+                        'notification_sent_date': notification_sent,
+                        'breach_date': breach_date,
+                        'indiana_affected': in_affected,
+                        'total_affected': total_affected,
+                        'pdf_url': pdf_url,
+                        'year': year,
+                        'page_number': page_num + 1,
+                        'row_index': row_idx
+                    }
+
+                    # Validate record has essential data
+                    if record['organization_name'] and record['organization_name'] not in ['None', 'null', '']:
+                        breach_records.append(record)
+                        logger.debug("Valid record found: %s - IN: %s, Total: %s", record['organization_name'], record['indiana_affected'], record['total_affected'])
+                    else:
+                        logger.debug("Skipped invalid record: %s", record)
 
         logger.info(f"Extracted {len(breach_records)} breach records from {year} PDF")
         return breach_records
@@ -273,31 +483,39 @@ def parse_pdf_table_data(pdf_url: str, year: str) -> list:
         logger.error(f"Error parsing PDF {pdf_url}: {e}")
         return []
 
+def parse_filter_date_in(filter_from_date: str | None) -> date | None:
+    """
+    Parse the FILTER_FROM_DATE setting (YYYY-MM-DD) once per run.
+    An invalid value disables the filter, so every record is processed.
+    """
+    if not filter_from_date:
+        return None
+    try:
+        return datetime.strptime(filter_from_date, "%Y-%m-%d").date()
+    except ValueError:
+        logger.warning(f"Invalid FILTER_FROM_DATE format '{filter_from_date}', processing all records")
+        return None
+
+FILTER_DATE = parse_filter_date_in(FILTER_FROM_DATE)
+
 def should_process_record(record: dict) -> bool:
     """
     Determine if a breach record should be processed based on date filtering.
     """
-    if not FILTER_FROM_DATE:
+    if FILTER_DATE is None:
         return True
 
-    try:
-        filter_date = datetime.strptime(FILTER_FROM_DATE, "%Y-%m-%d")
-
-        # Try to parse breach date or notification sent date
-        for date_field in ['notification_sent_date', 'breach_date']:
-            date_str = record.get(date_field, '')
-            if date_str:
-                parsed_date = parse_date_flexible_in(date_str)
-                if parsed_date:
-                    record_date = datetime.fromisoformat(parsed_date.replace('Z', '+00:00'))
-                    return record_date.date() >= filter_date.date()
-
-        # If no valid date found, include the record
-        return True
+    # Compare the first parsable date - notification sent, else breach - as a date object,
+    # without an ISO string round-trip
+    for date_field in ['notification_sent_date', 'breach_date']:
+        date_str = record.get(date_field, '')
+        if date_str:
+            record_date = parse_date_in(date_str)
+            if record_date:
+                return record_date.date() >= FILTER_DATE
 
-    except Exception as e:
-        logger.warning(f"Error in date filtering: {e}")
-        return True
+    # If no valid date found, include the record
+    return True
 
 def process_indiana_ag_breaches():
     """
@@ -333,18 +551,44 @@ def process_indiana_ag_breaches():
     total_processed = 0
     total_inserted = 0
     total_skipped = 0
+    pending_inserts = []  # item_data dicts collected for the bulk insert after parsing
 
     # Step 2: Process each yearly PDF
     for year in sorted(years_to_process, reverse=True):  # Process newest first
         pdf_url = yearly_pdfs[year]
         logger.info(f"Processing {year} PDF: {pdf_url}")
 
-        # Extract breach records from PDF
-        breach_records = parse_pdf_table_data(pdf_url, year)
+        # Download the PDF, then extract its breach records
+        pdf_path = fetch_pdf_in(pdf_url)
+        if pdf_path is None:
+            continue
+        try:
+            breach_records = parse_pdf_table_data(pdf_path, pdf_url, year)
+        finally:
+            os.remove(pdf_path)
         if not breach_records:
             logger.warning(f"No breach records found in {year} PDF")
             continue
 
+        # One extraction timestamp for all records of this PDF instead of several clock reads per record
+        extracted_at_utc = datetime.now(timezone.utc).isoformat()
+
+        # Every record from a yearly PDF carries the same tags (the PDF lists no data types)
+        year_tags = [*INDIANA_AG_TAGS, f"year_{year}"]
+
+        # raw_data fields that are identical for every record of this PDF, merged in per record
+        tier1_static = {
+            "pdf_url": pdf_url,
+            "pdf_year": year,
+            "processing_mode": PROCESSING_MODE,
+            "affected_individuals_scope": "Both Indiana residents and total affected available"
+        }
+        regulatory_context = {
+            "state": "Indiana",
+            "reporting_authority": "Indiana Attorney General",
+            "disclosure_law": "Indiana Data Breach Notification Law"
+        }
+
         # Step 3: Process each breach record
         for record_idx, record in enumerate(breach_records):
             total_processed += 1
@@ -352,7 +596,7 @@ def process_indiana_ag_breaches():
             try:
                 # Apply date filtering
                 if not should_process_record(record):
-                    logger.debug(f"Skipping record due to date filter: {record.get('organization_name', 'Unknown')}")
+                    logger.debug("Skipping record due to date filter: %s", record.get('organization_name', 'Unknown'))
                     total_skipped += 1
                     continue
 
@@ -375,25 +619,22 @@ def process_indiana_ag_breaches():
                 raw_data = {
                     # Tier 1: Portal Data (Raw extraction from PDF)
                     "tier_1_portal_data": {
-                        "pdf_url": pdf_url,
-                        "pdf_year": year,
-                        "extraction_timestamp": datetime.now().isoformat(),
+                        **tier1_static,
+                        "extraction_timestamp": extracted_at_utc,
                         "page_number": record.get('page_number'),
                         "row_index": record.get('row_index'),
                         "raw_organization_name": record.get('organization_name', ''),
                         "raw_breach_date": record.get('breach_date', ''),
                         "raw_notification_sent_date": record.get('notification_sent_date', ''),
                         "raw_indiana_affected": record.get('indiana_affected', ''),
-                        "raw_total_affected": record.get('total_affected', ''),
-                        "processing_mode": PROCESSING_MODE,
-                        "affected_individuals_scope": "Both Indiana residents and total affected available"
+                        "raw_total_affected": record.get('total_affected', '')
                     },
 
                     # Tier 2: Derived/Enrichment (Computed fields)
                     "tier_2_derived_data": {
                         "incident_uid": incident_uid,
-                        "portal_first_seen_utc": datetime.now().isoformat(),
-                        "portal_last_seen_utc": datetime.now().isoformat(),
+                        "portal_first_seen_utc": extracted_at_utc,
+                        "portal_last_seen_utc": extracted_at_utc,
                         "breach_record_index": record_idx + 1,
                         "data_types_normalized": data_types_compromised,
                         "indiana_affected_parsed": indiana_affected,
@@ -413,12 +654,8 @@ def process_indiana_ag_breaches():
                             "breach_date": breach_date_iso,
                             "notification_sent_date": notification_sent_date_iso
                         },
-                        "regulatory_context": {
-                            "state": "Indiana",
-                            "reporting_authority": "Indiana Attorney General",
-                            "disclosure_law": "Indiana Data Breach Notification Law"
-                        },
-                        "analysis_timestamp": datetime.now().isoformat()
+                        "regulatory_context": regulatory_context,
+                        "analysis_timestamp": extracted_at_utc
                     }
                 }
 
@@ -438,16 +675,6 @@ def process_indiana_ag_breaches():
                 summary_parts.append("reported to Indiana Attorney General")
                 summary = ". ".join(summary_parts) + "."
 
-                # Enhanced tags
-                tags = ["indiana_ag", "in_breach", "data_breach", f"year_{year}"]
-                for data_type in data_types_compromised:
-                    if "Social Security" in data_type:
-                        tags.append("ssn_breach")
-                    elif "Medical" in data_type:
-                        tags.append("healthcare_breach")
-                    elif "Financial" in data_type:
-                        tags.append("financial_breach")
-
                 # Prepare item data for database
                 item_data = {
                     "source_id": SOURCE_ID_INDIANA_AG,
@@ -456,7 +683,7 @@ def process_indiana_ag_breaches():
                     "publication_date": notification_sent_date_iso or breach_date_iso,
                     "summary_text": summary,
                     "raw_data_json": raw_data,
-                    "tags_keywords": list(set(tags)),
+                    "tags_keywords": year_tags,
 
                     # Standardized breach fields (now with total affected individuals)
                     "affected_individuals": total_affected,  # Total affected across all states
@@ -466,33 +693,36 @@ def process_indiana_ag_breaches():
 
                     # Enhanced fields
                     "data_types_compromised": data_types_compromised,
-                    "keywords_detected": ["indiana", "breach", "notification", "attorney_general"],
+                    "keywords_detected": INDIANA_AG_KEYWORDS,
                     "file_size_bytes": None,  # Could be added if needed
 
                     # Note: what_was_leaked not available in Indiana AG PDF format
                     # Note: indiana_residents_affected stored in raw_data_json tier_2_derived_data
                 }
 
-                # Check for existing record
-                enhancement_status = supabase_client.get_item_enhancement_status(unique_url)
-                if enhancement_status.get('exists'):
-                    logger.info(f"Record already exists for {org_name} ({year}), skipping")
-                    total_skipped += 1
-                    continue
-
-                # Insert into database
-                insert_response = supabase_client.insert_item(**item_data)
-                if insert_response:
-                    logger.info(f"Successfully inserted: {org_name} ({year}) - {total_affected or 'Unknown'} total affected, {indiana_affected or 'Unknown'} IN residents")
-                    total_inserted += 1
-                else:
-                    logger.error(f"Failed to insert: {org_name} ({year})")
-                    total_skipped += 1
+                # Queue for the bulk insert after all records are built
+                pending_inserts.append(item_data)
+                logger.debug("Queued: %s (%s) - %s total affected, %s IN residents", org_name, year, total_affected or 'Unknown', indiana_affected or 'Unknown')
 
             except Exception as e:
-                logger.error(f"Error processing breach record {record_idx + 1} from {year}: {e}", exc_info=True)
+                # Tracebacks only at DEBUG, so a broken PDF layout doesn't format one per row
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.error("Error processing breach record %d from %s: %s", record_idx + 1, year, e, exc_info=True)
+                else:
+                    logger.warning("Error processing breach record %d from %s: %s", record_idx + 1, year, e)
                 total_skipped += 1
 
+    # Step 4: Insert all records in batches, sending the batch requests concurrently.
+    # insert_items upserts with ignore_duplicates on the unique item_url, so records that
+    # already exist are dropped by the database instead of being looked up first.
+    if pending_inserts:
+        inserted = supabase_client.insert_items(
+            pending_inserts, batch_size=INSERT_BATCH_SIZE, max_workers=INSERT_MAX_WORKERS
+        )
+        total_inserted += len(inserted)
+        total_skipped += len(pending_inserts) - len(inserted)
+        logger.info(f"{len(pending_inserts) - len(inserted)} of {len(pending_inserts)} records already existed or failed to insert")
+
     logger.info(f"Enhanced Indiana AG processing complete:")
     logger.info(f"  Total records processed: {total_processed}")
     logger.info(f"  Successfully inserted: {total_inserted}")
@@ -521,5 +751,8 @@ if __name__ == "__main__":
         except Exception as e:
             logger.error(f"Critical error in Indiana AG scraper: {e}", exc_info=True)
             exit(1)
+        finally:
+            close_session()
+            close_pdf_executor()
 
     logger.info("Enhanced Indiana AG Security Breach Scraper Finished")
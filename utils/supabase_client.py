@@ -2,6 +2,7 @@ import os
 from supabase import create_client, Client
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,8 @@ class SupabaseClient:
         if not url or not key:
             raise ValueError("Supabase URL and Key must be set as environment variables.")
         self.client: Client = create_client(url, key)
+        # Reuse one request builder for scraped_items instead of rebuilding it on every call
+        self._table = self.client.table("scraped_items")
         logger.info("Supabase client initialized.")
 
     def check_item_exists(self, item_url: str) -> bool:
@@ -69,106 +72,156 @@ class SupabaseClient:
         Check if an item with the given URL already exists in the database.
         """
         try:
-            response = self.client.table("scraped_items").select("id").eq("item_url", item_url).execute()
+            response = self._table.select("id").eq("item_url", item_url).execute()
             return len(response.data) > 0
         except Exception as e:
             logger.error(f"Error checking if item exists for URL {item_url}: {e}")
             return False
 
+    def get_existing_item_urls_among(self, item_urls: list, chunk_size: int = 50) -> set:
+        """
+        Return the subset of item_urls that already exist, with one `in` query per chunk.
+        Lets a scraper skip known items without calling check_item_exists() per record;
+        chunks keep the request URL within proxy length limits.
+        """
+        existing = set()
+        for i in range(0, len(item_urls), chunk_size):
+            response = self._table.select("item_url").in_("item_url", item_urls[i:i + chunk_size]).execute()
+            existing.update(item['item_url'] for item in response.data)
+        return existing
+
+    @staticmethod
+    def _build_enhancement_status(item: dict) -> dict:
+        """
+        Derive enhancement status flags from a scraped_items row
+        (id, raw_data_json, affected_individuals, notice_document_url).
+        """
+        raw_data = item.get('raw_data_json') or {}
+
+        # Check enhancement status
+        enhancement_status = {
+            'exists': True,
+            'item_id': item['id'],
+            'has_enhancement_errors': False,
+            'has_successful_enhancement': False,
+            'has_pdf_analysis': False,
+            'affected_individuals': item.get('affected_individuals'),
+            'notice_document_url': item.get('notice_document_url'),
+            'raw_data_json': raw_data,  # Include raw data for detailed checking
+            'enhancement_errors': []
+        }
+
+        # Check for enhancement errors in tier_2_enhanced
+        tier_2_data = raw_data.get('tier_2_enhanced', {})
+        if isinstance(tier_2_data, dict):
+            enhancement_errors = tier_2_data.get('enhancement_errors', [])
+            if enhancement_errors:
+                enhancement_status['has_enhancement_errors'] = True
+                enhancement_status['enhancement_errors'] = enhancement_errors
+
+            # Check if enhancement was attempted but failed
+            enhancement_attempted = tier_2_data.get('enhancement_attempted', False)
+            detail_page_data = tier_2_data.get('detail_page_data', {})
+
+            if enhancement_attempted and detail_page_data:
+                if detail_page_data.get('detail_page_scraped', False):
+                    enhancement_status['has_successful_enhancement'] = True
+
+        # Check for PDF analysis
+        tier_3_data = raw_data.get('tier_3_pdf_analysis', [])
+        if tier_3_data:
+            # Check if any PDF was successfully analyzed
+            for pdf_analysis in tier_3_data:
+                if isinstance(pdf_analysis, dict) and pdf_analysis.get('pdf_analyzed', False):
+                    enhancement_status['has_pdf_analysis'] = True
+                    break
+
+        return enhancement_status
+
+    def get_enhancement_statuses_for_source(self, source_id: int, page_size: int = 1000) -> dict:
+        """
+        Fetch the enhancement status of every existing item for a source in bulk.
+        Returns a dict keyed by item_url with the same shape as get_item_enhancement_status(),
+        so scrapers can look items up locally instead of issuing one SELECT per record.
+        """
+        statuses = {}
+        start = 0
+        while True:
+            response = self._table.select(
+                "id, item_url, raw_data_json, affected_individuals, notice_document_url"
+            ).eq("source_id", source_id).order("id").range(start, start + page_size - 1).execute()
+
+            for item in response.data:
+                statuses[item['item_url']] = self._build_enhancement_status(item)
+
+            if len(response.data) < page_size:
+                break
+            start += page_size
+
+        logger.info(f"Loaded enhancement status for {len(statuses)} existing items (source_id={source_id})")
+        return statuses
+
     def get_item_enhancement_status(self, item_url: str) -> dict:
         """
         Get the enhancement status of an existing item to determine if it needs updating.
         Returns information about enhancement attempts and success/failure status.
         """
         try:
-            response = self.client.table("scraped_items").select(
+            response = self._table.select(
                 "id, raw_data_json, affected_individuals, notice_document_url"
             ).eq("item_url", item_url).execute()
 
             if not response.data:
                 return {'exists': False}
 
-            item = response.data[0]
-            raw_data = item.get('raw_data_json', {})
-
-            # Check enhancement status
-            enhancement_status = {
-                'exists': True,
-                'item_id': item['id'],
-                'has_enhancement_errors': False,
-                'has_successful_enhancement': False,
-                'has_pdf_analysis': False,
-                'affected_individuals': item.get('affected_individuals'),
-                'notice_document_url': item.get('notice_document_url'),
-                'raw_data_json': raw_data,  # Include raw data for detailed checking
-                'enhancement_errors': []
-            }
-
-            # Check for enhancement errors in tier_2_enhanced
-            tier_2_data = raw_data.get('tier_2_enhanced', {})
-            if isinstance(tier_2_data, dict):
-                enhancement_errors = tier_2_data.get('enhancement_errors', [])
-                if enhancement_errors:
-                    enhancement_status['has_enhancement_errors'] = True
-                    enhancement_status['enhancement_errors'] = enhancement_errors
-
-                # Check if enhancement was attempted but failed
-                enhancement_attempted = tier_2_data.get('enhancement_attempted', False)
-                detail_page_data = tier_2_data.get('detail_page_data', {})
-
-                if enhancement_attempted and detail_page_data:
-                    if detail_page_data.get('detail_page_scraped', False):
-                        enhancement_status['has_successful_enhancement'] = True
-
-            # Check for PDF analysis
-            tier_3_data = raw_data.get('tier_3_pdf_analysis', [])
-            if tier_3_data:
-                # Check if any PDF was successfully analyzed
-                for pdf_analysis in tier_3_data:
-                    if isinstance(pdf_analysis, dict) and pdf_analysis.get('pdf_analyzed', False):
-                        enhancement_status['has_pdf_analysis'] = True
-                        break
-
-            return enhancement_status
+            return self._build_enhancement_status(response.data[0])
 
         except Exception as e:
             logger.error(f"Error getting item enhancement status: {e}")
             return {'exists': False}
 
-    def update_item_enhancement(self, item_id: str, enhanced_data: dict) -> bool:
+    @staticmethod
+    def _build_enhancement_update(enhanced_data: dict) -> dict:
         """
-        Update an existing item with new enhancement data.
-        Used when we have better enhancement data than what was previously stored.
+        Select and clean the enhancement fields that should overwrite an existing item.
         """
-        try:
-            # Prepare update data
-            update_data = {}
+        update_data = {}
+
+        # Update affected individuals if we have new data
+        if enhanced_data.get('affected_individuals') is not None:
+            update_data['affected_individuals'] = enhanced_data['affected_individuals']
+
+        # Update notice document URL if we have new data
+        if enhanced_data.get('notice_document_url'):
+            update_data['notice_document_url'] = clean_text_for_database(enhanced_data['notice_document_url'])
 
-            # Update affected individuals if we have new data
-            if enhanced_data.get('affected_individuals') is not None:
-                update_data['affected_individuals'] = enhanced_data['affected_individuals']
+        # Update what_was_leaked if we have new data
+        if enhanced_data.get('what_was_leaked'):
+            update_data['what_was_leaked'] = clean_text_for_database(enhanced_data['what_was_leaked'])
 
-            # Update notice document URL if we have new data
-            if enhanced_data.get('notice_document_url'):
-                update_data['notice_document_url'] = clean_text_for_database(enhanced_data['notice_document_url'])
+        # Update summary and content if we have enhanced versions
+        if enhanced_data.get('summary_text'):
+            update_data['summary_text'] = clean_text_for_database(enhanced_data['summary_text'])
 
-            # Update what_was_leaked if we have new data
-            if enhanced_data.get('what_was_leaked'):
-                update_data['what_was_leaked'] = clean_text_for_database(enhanced_data['what_was_leaked'])
+        if enhanced_data.get('full_content'):
+            update_data['full_content'] = clean_text_for_database(enhanced_data['full_content'])
 
-            # Update summary and content if we have enhanced versions
-            if enhanced_data.get('summary_text'):
-                update_data['summary_text'] = clean_text_for_database(enhanced_data['summary_text'])
+        # Update raw_data_json with new enhancement data (clean recursively)
+        if enhanced_data.get('raw_data_json'):
+            update_data['raw_data_json'] = clean_data_recursively(enhanced_data['raw_data_json'])
 
-            if enhanced_data.get('full_content'):
-                update_data['full_content'] = clean_text_for_database(enhanced_data['full_content'])
+        return update_data
 
-            # Update raw_data_json with new enhancement data (clean recursively)
-            if enhanced_data.get('raw_data_json'):
-                update_data['raw_data_json'] = clean_data_recursively(enhanced_data['raw_data_json'])
+    def update_item_enhancement(self, item_id: str, enhanced_data: dict) -> bool:
+        """
+        Update an existing item with new enhancement data.
+        Used when we have better enhancement data than what was previously stored.
+        """
+        try:
+            update_data = self._build_enhancement_update(enhanced_data)
 
             # Perform the update
-            response = self.client.table("scraped_items").update(update_data).eq("id", item_id).execute()
+            response = self._table.update(update_data).eq("id", item_id).execute()
 
             if response.data:
                 logger.info(f"Successfully updated item enhancement data for ID: {item_id}")
@@ -246,13 +299,11 @@ class SupabaseClient:
                 "industry_classification": industry_classification,
                 # scraped_at and created_at have defaults in the DB
             }
-            # Remove keys where value is None to rely on DB defaults or avoid inserting nulls unnecessarily for optional fields
-            data_to_insert = {k: v for k, v in data_to_insert.items() if v is not None}
-
-            # Clean all text data to prevent Unicode errors in PostgreSQL
-            data_to_insert = clean_data_recursively(data_to_insert)
+            # Remove keys where value is None to rely on DB defaults or avoid inserting nulls unnecessarily for optional fields,
+            # and clean all text data to prevent Unicode errors in PostgreSQL, in a single pass
+            data_to_insert = {k: clean_data_recursively(v) for k, v in data_to_insert.items() if v is not None}
 
-            response = self.client.table("scraped_items").insert(data_to_insert).execute()
+            response = self._table.insert(data_to_insert).execute()
 
             # Check for errors in the response
             if hasattr(response, 'error') and response.error:
@@ -278,6 +329,91 @@ class SupabaseClient:
                 logger.error(f"Error code: {e.code}")
             return None
 
+    def _insert_batch(self, items: list) -> list:
+        """
+        Inserts one batch of items with a single upsert request.
+        Falls back to row-by-row inserts if the batch request fails.
+        """
+        # Like insert_item(), None values are dropped so the database defaults apply
+        batch = [
+            {k: clean_data_recursively(v) for k, v in item.items() if v is not None}
+            for item in items
+        ]
+        return self._upsert_rows(batch)
+
+    def _upsert_rows(self, rows: list) -> list:
+        """
+        Upserts cleaned rows in one request. Rows may carry different keys; columns a
+        row omits take their database default instead of NULL.
+        If the request fails the rows are retried in halves, so one bad row costs a few
+        extra requests rather than one per row; a lone failing row goes through insert_item().
+        """
+        try:
+            response = self._table.upsert(
+                rows, on_conflict="item_url", ignore_duplicates=True, default_to_null=False
+            ).execute()
+            logger.info(f"Successfully inserted {len(response.data or [])}/{len(rows)} items in batch")
+            return response.data or []
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Error inserting item {rows[0].get('item_url')} in batch: {e}. Retrying as a single insert.")
+                result = self.insert_item(**{k: v for k, v in rows[0].items() if v is not None})
+                return [result] if result else []
+
+            mid = len(rows) // 2
+            logger.error(f"Error inserting batch of {len(rows)} items: {e}. Retrying in halves.")
+            return self._upsert_rows(rows[:mid]) + self._upsert_rows(rows[mid:])
+
+    def insert_items(self, items: list, batch_size: int = 50, max_workers: int = 1) -> list:
+        """
+        Inserts many items into the scraped_items table, one request per batch.
+        Each item is a dict using the same field names as insert_item().
+        Rows whose item_url already exists are skipped rather than overwritten.
+        With max_workers > 1, batches are sent concurrently over the shared client.
+        Returns the list of rows that were actually written.
+        """
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+        if max_workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._insert_batch, batches))
+        else:
+            results = [self._insert_batch(batch) for batch in batches]
+
+        return [row for result in results for row in result]
+
+    def _update_item_enhancement_by_url(self, item: dict) -> list:
+        """
+        Update one existing item, matched on item_url, with its enhancement fields.
+        Returns the updated rows (empty if the update failed).
+        """
+        item_url = clean_text_for_database(item['item_url'])
+        try:
+            response = self._table.update(self._build_enhancement_update(item)).eq("item_url", item_url).execute()
+            return response.data or []
+        except Exception as e:
+            logger.error(f"Error updating enhancement data for {item_url}: {e}")
+            return []
+
+    def update_items_enhancement(self, items: list, max_workers: int = 1) -> list:
+        """
+        Update many existing items with new enhancement data.
+        Each item is a full item dict (as passed to insert_item()); rows are matched
+        on item_url and only the enhancement fields that item carries are written,
+        so columns it doesn't provide keep their stored values.
+        With max_workers > 1, updates are sent concurrently over the shared client.
+        Returns the list of rows that were actually updated.
+        """
+        if max_workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._update_item_enhancement_by_url, items))
+        else:
+            results = [self._update_item_enhancement_by_url(item) for item in items]
+
+        updated = [row for result in results for row in result]
+        logger.info(f"Successfully updated enhancement data for {len(updated)}/{len(items)} items")
+        return updated
+
     # We can add more methods later, e.g., for inserting into 'data_sources'
     # or for querying/updating records.
 